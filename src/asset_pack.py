@@ -0,0 +1,210 @@
+"""
+Pack of decoded graphics.
+
+Decoding PNGs is most of the time it takes to load a graphic. The pack
+holds the decoded pixels of every graphic in one file, so they're
+memory mapped and copied into surfaces with pygame.image.frombuffer
+instead:
+
+    header
+    entries    (offset, size, width, height, format, source mtime,
+                source size, path length) records, each followed by
+                the source path
+    pixels     RGBA or RGB rows of every entry, in entry order
+
+Every entry remembers the modification time and size of the file it was
+decoded from. When any graphic changed, or is missing from the pack, the
+pack is stale. Graphics are then decoded from their files as usual, and
+a new pack is built in the background for the next launch.
+"""
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple
+
+import mmap
+import os
+import struct
+import threading
+import traceback
+
+import pygame
+
+from . import tools
+
+
+PACK_PATH = os.path.join("cache", "graphics.pack")
+
+# Bump when the layout of the file changes.
+FORMAT_VERSION = 1
+MAGIC = b"GPAK"
+
+HEADER = struct.Struct("<4sHI")
+ENTRY = struct.Struct("<QQIIBqQH")
+
+FORMATS = ["RGB", "RGBA"]
+
+Entry = NamedTuple("Entry", [
+    ("offset", int),
+    ("size", int),
+    ("width", int),
+    ("height", int),
+    ("format", str),
+    ("mtime", int),
+    ("source_size", int),
+])
+
+
+def source_stamp(path: str) -> Optional[Tuple[int, int]]:
+    """Modification time and size of a source file, or None if it's
+    missing."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class AssetPack:
+    """Loads graphics out of a pack, falling back on their files.
+
+    :param sources: Name to file path, like tools.index_gfx.
+    """
+    def __init__(self, sources: Dict[str, str], path: str=PACK_PATH) -> None:
+        self.path = path
+        self.sources = sources
+
+        self.entries = {} # type: Dict[str, Entry]
+        self.__map = None # type: Optional[mmap.mmap]
+        self.open()
+
+        self.stale = any(not self.fresh(source) for source in sources.values())
+        if self.stale:
+            # Let go of the file, so the new pack can replace it.
+            self.close()
+
+
+    def open(self) -> None:
+        """Map the pack file and read its entries. A missing or broken
+        pack has no entries."""
+        try:
+            with open(self.path, "rb") as f:
+                self.__map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self.entries = read_entries(self.__map)
+        except (OSError, ValueError):
+            self.close()
+
+
+    def close(self) -> None:
+        """Unmap the pack."""
+        self.entries = {}
+        if self.__map is not None:
+            self.__map.close()
+            self.__map = None
+
+
+    def fresh(self, source: str) -> bool:
+        entry = self.entries.get(source)
+        return entry is not None and (entry.mtime, entry.source_size) == source_stamp(source)
+
+
+    def decode(self, source: str) -> pygame.Surface:
+        """Same as pygame.image.load, from the pack when the pixels there
+        are still those of the file. Safe on any thread."""
+        if not self.fresh(source):
+            return pygame.image.load(source)
+
+        entry = self.entries[source]
+        pixels = memoryview(self.__map)[entry.offset:entry.offset + entry.size]
+        # frombuffer shares the mapped memory, which is read only. Writing
+        # to it would crash, so the surface gets pixels of its own.
+        image = pygame.image.frombuffer(pixels, (entry.width, entry.height), entry.format).copy()
+        pixels.release()
+        return image
+
+
+    def load(self, source: str) -> pygame.Surface:
+        """Same as tools.load_image."""
+        return tools.prepare_image(self.decode(source))
+
+
+    def rebuild(self, background: bool=True) -> Optional[threading.Thread]:
+        """Build a new pack if this one is stale. It's used from the next
+        launch on."""
+        if not self.stale:
+            return None
+
+        thread = threading.Thread(target=self.__rebuild, daemon=True)
+        if background:
+            thread.start()
+        else:
+            thread.run()
+        return thread
+
+
+    def __rebuild(self) -> None:
+        try:
+            build(self.sources.values(), self.path)
+        except Exception:
+            # The pack only saves time, the graphics still load without it.
+            traceback.print_exc()
+
+
+def read_entries(raw: mmap.mmap) -> Dict[str, Entry]:
+    """Raises ValueError when raw isn't a pack of this version."""
+    if len(raw) < HEADER.size:
+        raise ValueError("pack file is too short")
+
+    magic, format_version, count = HEADER.unpack_from(raw)
+    if magic != MAGIC or format_version != FORMAT_VERSION:
+        raise ValueError("not a pack file of this version")
+
+    entries = {} # type: Dict[str, Entry]
+    offset = HEADER.size
+    for _ in range(count):
+        pixel_offset, size, width, height, format_index, mtime, source_size, path_length = ENTRY.unpack_from(raw, offset)
+        offset += ENTRY.size
+        source = raw[offset:offset + path_length].decode("utf-8")
+        offset += path_length
+
+        if pixel_offset + size > len(raw):
+            raise ValueError("pack entry {} is past the end of the file".format(source))
+        entries[source] = Entry(pixel_offset, size, width, height, FORMATS[format_index], mtime, source_size)
+
+    return entries
+
+
+def decode_pixels(source: str) -> Optional[Tuple[str, Tuple[int, int], Tuple[int, int], str, bytes]]:
+    """(source, stamp, size, format, pixels) of a source file, or None if
+    it's missing."""
+    stamp = source_stamp(source)
+    if stamp is None:
+        return None
+
+    image = pygame.image.load(source)
+    image_format = "RGBA" if image.get_flags() & pygame.SRCALPHA else "RGB"
+    return source, stamp, image.get_size(), image_format, pygame.image.tobytes(image, image_format)
+
+
+def build(sources: Iterable[str], path: str=PACK_PATH) -> None:
+    """Decode every source file and write them all into a pack at path."""
+    sources = sorted(set(sources))
+    decoded = [pixels for pixels in tools.decode_all(decode_pixels, dict(zip(sources, sources))).values() if pixels is not None]
+
+    paths = [source.encode("utf-8") for source, _, _, _, _ in decoded]
+    pixel_offset = HEADER.size + sum(ENTRY.size + len(source) for source in paths)
+
+    chunks = [HEADER.pack(MAGIC, FORMAT_VERSION, len(decoded))]
+    for source, (_, (mtime, source_size), (width, height), image_format, pixels) in zip(paths, decoded):
+        chunks.append(ENTRY.pack(pixel_offset, len(pixels), width, height, FORMATS.index(image_format), mtime, source_size, len(source)))
+        chunks.append(source)
+        pixel_offset += len(pixels)
+    chunks.extend(pixels for _, _, _, _, pixels in decoded)
+
+    directory = os.path.dirname(path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory, exist_ok=True)
+
+    # Write next to the real file and swap it in, so a game starting at
+    # the same time never maps half a pack.
+    temp_path = "{}.{}.tmp".format(path, os.getpid())
+    with open(temp_path, "wb") as f:
+        f.write(b"".join(chunks))
+    os.replace(temp_path, path)
@@ -0,0 +1,174 @@
+"""
+Assets loaded on first use.
+
+setup.GFX, FONTS and SFX are registries. At startup only the names of
+the asset files are found, nothing is decoded. An asset is loaded the
+first time it's asked for and kept after that, so the main menu doesn't
+wait on every icon in the game.
+
+Loading is split in two. Decoding, the slow part, is safe on any thread.
+Finishing, like converting a surface for the display, is done by the
+thread that reads the asset first, which is the main thread in the game.
+
+Assets that will be needed soon, like the tiles and the hero once the
+menu is up, can be warmed up: decoded in a thread pool in the background,
+and finished when the game reads them.
+"""
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+import collections.abc
+import concurrent.futures
+import threading
+import time
+import traceback
+
+from . import constants as c
+
+
+class Registry(collections.abc.MutableMapping):
+    """A mapping of name to asset, loading assets as they are read.
+
+    :param sources: Name to whatever decode needs, like a file path.
+    :param decode: Turns a source into the asset.
+    :param finish: Called with the source and the decoded asset, when the
+                   asset is first read. Optional.
+    """
+    def __init__(self, sources: Dict[str, Any], decode: Callable[[Any], Any], finish: Optional[Callable[[Any, Any], Any]]=None) -> None:
+        self.sources = dict(sources)
+        self.decode = decode
+        self.finish = finish
+
+        self.__loaded = {} # type: Dict[str, Any]
+        # Decoded by the warm up, not finished yet.
+        self.__decoded = {} # type: Dict[str, Any]
+
+        # One lock per asset, held while loading it, so the warm up and the
+        # game never load the same asset twice, but don't wait on each
+        # other for different ones.
+        self.__loading = {} # type: Dict[str, threading.Lock]
+        self.__lock = threading.Lock()
+
+        # Seconds spent loading each asset, decoding and finishing.
+        self.timings = {} # type: Dict[str, float]
+        # Seconds the last warm up took, once it's done.
+        self.warm_up_time = None # type: Optional[float]
+
+
+    def __getitem__(self, name: str) -> Any:
+        try:
+            return self.__loaded[name]
+        except KeyError:
+            pass
+
+        source = self.sources[name]
+        with self.__loading_lock(name):
+            if name not in self.__loaded:
+                start = time.perf_counter()
+                if name in self.__decoded:
+                    asset = self.__decoded.pop(name)
+                else:
+                    asset = self.decode(source)
+                if self.finish is not None:
+                    asset = self.finish(source, asset)
+                self.__loaded[name] = asset
+                self.timings[name] = self.timings.get(name, 0) + time.perf_counter() - start
+            return self.__loaded[name]
+
+
+    def __setitem__(self, name: str, asset: Any) -> None:
+        with self.__lock:
+            self.__loaded[name] = asset
+
+
+    def __delitem__(self, name: str) -> None:
+        with self.__lock:
+            found = False
+            if name in self.__loaded:
+                del self.__loaded[name]
+                found = True
+            if name in self.sources:
+                del self.sources[name]
+                found = True
+            self.__decoded.pop(name, None)
+
+        if not found:
+            raise KeyError(name)
+
+
+    def __contains__(self, name: object) -> bool:
+        # Without loading it.
+        return name in self.sources or name in self.__loaded
+
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self.sources
+        for name in list(self.__loaded):
+            if name not in self.sources:
+                yield name
+
+
+    def __len__(self) -> int:
+        return len(self.sources.keys() | self.__loaded.keys())
+
+
+    def loaded(self, name: str) -> bool:
+        return name in self.__loaded
+
+
+    def warm_up(self, names: Iterable[str], background: bool=True, workers: int=c.ASSET_WORKERS) -> threading.Thread:
+        """Decode names ahead of time. Names that don't exist are skipped.
+
+        :param background: Decode from a daemon thread, returned started.
+                           Otherwise it is run before returning.
+        :param workers: Threads decoding at once.
+        """
+        thread = threading.Thread(target=self.__warm_up, args=(list(names), workers), daemon=True)
+        if background:
+            thread.start()
+        else:
+            thread.run()
+        return thread
+
+
+    def __warm_up(self, names: List[str], workers: int) -> None:
+        start = time.perf_counter()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(self.__decode_ahead, names))
+        self.warm_up_time = time.perf_counter() - start
+
+
+    def __decode_ahead(self, name: str) -> None:
+        if name not in self.sources:
+            return
+
+        with self.__loading_lock(name):
+            if name in self.__loaded or name in self.__decoded:
+                return
+            try:
+                start = time.perf_counter()
+                self.__decoded[name] = self.decode(self.sources[name])
+                self.timings[name] = time.perf_counter() - start
+            except Exception:
+                # The game hits the same error when it loads the asset.
+                traceback.print_exc()
+
+
+    def __loading_lock(self, name: str) -> threading.Lock:
+        with self.__lock:
+            return self.__loading.setdefault(name, threading.Lock())
+
+
+def report(registries: Dict[str, Registry], slowest: int=5) -> str:
+    """How long the assets of each registry took to load so far."""
+    lines = [] # type: List[str]
+    for kind, registry in registries.items():
+        timings = registry.timings
+        line = "{}: {} of {} loaded in {:.1f} ms".format(kind, len(timings), len(registry), sum(timings.values()) * 1000)
+        if registry.warm_up_time is not None:
+            line += ", warm up took {:.1f} ms".format(registry.warm_up_time * 1000)
+        lines.append(line)
+
+        for name in sorted(timings, key=timings.get, reverse=True)[:slowest]:
+            lines.append("    {:<32} {:6.1f} ms".format(name, timings[name] * 1000))
+
+    return "\n".join(lines)
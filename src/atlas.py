@@ -0,0 +1,60 @@
+"""
+Texture atlases.
+
+The ui_pack comes with sheets that hold all of its images, and a
+TextureAtlas XML file for every sheet that names the rect of each image:
+
+    <TextureAtlas imagePath="sheet.png">
+        <SubTexture name="green_button00.png" x="0" y="0" width="190" height="49"/>
+        ...
+    </TextureAtlas>
+
+Every image named in an atlas is a Region of its sheet. setup.GFX loads
+a region as a subsurface of the sheet, so one decoded sheet serves all
+of its images instead of a file being opened for each.
+"""
+from typing import Dict, NamedTuple, Tuple
+
+import os
+import xml.etree.ElementTree as ElementTree
+
+
+Region = NamedTuple("Region", [
+    # Name of the sheet in setup.GFX.
+    ("sheet", str),
+    # (x, y, width, height) on the sheet.
+    ("rect", Tuple[int, int, int, int]),
+])
+
+
+def index_atlases(path: str, sheets: Dict[str, str]) -> Dict[str, Region]:
+    """Image name to Region, for every atlas file in path.
+
+    :param sheets: The graphics that exist, by name. An atlas file is for
+                   the sheet with the same name. Atlases without one are
+                   skipped.
+    """
+    regions = {} # type: Dict[str, Region]
+
+    for item in sorted(os.listdir(path)):
+        sheet, ext = os.path.splitext(item)
+        if ext.lower() != ".xml":
+            continue
+        if sheet not in sheets:
+            print("No sheet for texture atlas. {}".format(item))
+            continue
+
+        regions.update(parse_atlas(os.path.join(path, item), sheet))
+
+    return regions
+
+
+def parse_atlas(path: str, sheet: str) -> Dict[str, Region]:
+    regions = {} # type: Dict[str, Region]
+
+    for sub_texture in ElementTree.parse(path).getroot().iter("SubTexture"):
+        name = os.path.splitext(sub_texture.get("name"))[0]
+        x, y, width, height = (int(sub_texture.get(key)) for key in ("x", "y", "width", "height"))
+        regions[name] = Region(sheet, (x, y, width, height))
+
+    return regions
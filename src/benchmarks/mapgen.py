@@ -0,0 +1,228 @@
+"""
+Map generation benchmarks.
+
+Times every phase of building a map, for each biome at several multiples
+of its map_mult. Runs headless under the SDL dummy video driver and only
+loads the tile graphics.
+
+Usage:
+    python3 -m src.benchmarks.mapgen run [--output results.json]
+    python3 -m src.benchmarks.mapgen compare old.json new.json
+
+Tile images are cut out of their sheets by the first map and shared by
+the maps after it. run --cold forgets them before every map, to time a
+first map each time, and --no-slice-cache turns off the images shared by
+helpers.get_image.
+
+compare exits with 1 when any phase got slower by more than the
+threshold, so it can fail a build.
+"""
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+import numpy as np
+import pygame
+
+from ..components import autotile, generation, helpers, tile_surfaces, tilemap
+
+from .. import constants as c
+from .. import setup
+from .. import tools
+
+
+DEFAULT_SCALES = [1, 5, 10, 50]
+DEFAULT_BIOMES = [c.Biome.FARMLAND, c.Biome.CAVE]
+
+# Phases faster than this are too noisy to call a regression.
+MIN_SECONDS = 0.001
+
+Results = Dict[str, Any]
+
+
+def start() -> None:
+    """Just enough of setup.start to build maps."""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+
+    setup.GFX = tools.recursive_load_gfx(os.path.join("data", "graphics", "tiles"))
+
+
+def grid_size(biome: c.Biome, scale: float) -> Tuple[int, int]:
+    """Grid size of a biome, with its map_mult scaled."""
+    width = round(c.DEFAULT_SCREEN_WIDTH * c.map_mult[biome] * scale / c.TILE_SIZE)
+    height = round(c.DEFAULT_SCREEN_HEIGHT * c.map_mult[biome] * scale / c.TILE_SIZE)
+    return width, height
+
+
+class Timer:
+    def __init__(self) -> None:
+        self.phases = {} # type: Dict[str, float]
+
+
+    def time(self, name: str, function: Callable[..., Any], *args: Any) -> Any:
+        start = time.perf_counter()
+        result = function(*args)
+        self.phases[name] = time.perf_counter() - start
+        return result
+
+
+def build_map(biome: c.Biome, width: int, height: int, seed: int) -> Dict[str, float]:
+    """Build one map the way tilemap.Map does, timing every phase."""
+    timer = Timer()
+    rng = random.Random(seed)
+    np_rng = np.random.RandomState(rng.getrandbits(32))
+
+    data = generation.MapData(width, height, biome)
+    data.seed = seed
+
+    front = timer.time("random_init", generation.random_grid, width, height, np_rng)
+    back = np.empty_like(front)
+    for step in range(generation.NUM_SIM_STEPS):
+        timer.time("simulation_step_{}".format(step + 1), generation.simulation_step, front, generation.DEATH_LIMIT, generation.BIRTH_LIMIT, back)
+        front, back = back, front
+    data.grid.array[:, :] = front
+
+    masks = None
+    if biome == c.Biome.FARMLAND:
+        masks = timer.time("swap_passes", autotile.settle, data.grid.array)
+
+    timer.time("place", generation.place, data, masks, rng)
+
+    map_width = width * c.TILE_SIZE
+    map_height = height * c.TILE_SIZE
+    tile_map = timer.time("create_scenery", tilemap.Map, width, height, map_width, map_height, biome, data)
+
+    # The first frame bakes the render chunks around the camera.
+    camera = pygame.rect.Rect((0, 0), c.DEFAULT_SCREEN_SIZE)
+    camera.center = tile_map.rect.center
+    surface = pygame.Surface(camera.size).convert()
+    timer.time("first_frame", tile_map.update, surface, camera, camera.topleft)
+
+    timer.phases["total"] = sum(timer.phases.values())
+    return timer.phases
+
+
+def run(biomes: List[c.Biome], scales: List[float], repeat: int, seed: int, cold: bool=False) -> Results:
+    """:param cold: Forget the images cut out of sheets before every map."""
+    results = {} # type: Results
+    for biome in biomes:
+        for scale in scales:
+            width, height = grid_size(biome, scale)
+
+            # Keep the fastest of each phase, the others are mostly noise.
+            best = {} # type: Dict[str, float]
+            hits, misses = helpers.hits, helpers.misses
+            for _ in range(repeat):
+                if cold:
+                    tile_surfaces.clear()
+                    helpers.clear()
+                for name, seconds in build_map(biome, width, height, seed).items():
+                    best[name] = min(seconds, best.get(name, seconds))
+
+            key = "{}@{}x".format(biome.name.lower(), scale)
+            results[key] = {
+                "biome": biome.name,
+                "scale": scale,
+                "grid": [width, height],
+                "phases": best,
+                "slice_cache": {"hits": helpers.hits - hits, "misses": helpers.misses - misses},
+            }
+            print("{:<16} {:>5}x{:<5} {:>9.3f}s".format(key, width, height, best["total"]), file=sys.stderr)
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pygame": pygame.version.ver,
+            "platform": platform.platform(),
+            "generator_version": generation.GENERATOR_VERSION,
+            "repeat": repeat,
+            "seed": seed,
+            "cold": cold,
+            "slice_cache": c.SLICE_CACHE,
+        },
+        "results": results,
+    }
+
+
+def compare(old: Results, new: Results, threshold: float) -> List[str]:
+    """Every phase that got slower by more than threshold (0.1 = 10%).
+
+    Only runs and phases found in both results are compared.
+    """
+    regressions = [] # type: List[str]
+    for key, new_run in new["results"].items():
+        old_run = old["results"].get(key)
+        if old_run is None:
+            continue
+
+        for phase, new_seconds in new_run["phases"].items():
+            old_seconds = old_run["phases"].get(phase)
+            if old_seconds is None or new_seconds < MIN_SECONDS:
+                continue
+
+            if new_seconds > old_seconds * (1 + threshold):
+                regressions.append("{} {}: {:.4f}s -> {:.4f}s".format(key, phase, old_seconds, new_seconds))
+
+    return regressions
+
+
+def main(argv: Optional[List[str]]=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1], formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command")
+
+    run_parser = commands.add_parser("run", help="time map generation")
+    run_parser.add_argument("--output", "-o", help="write the JSON results here, instead of stdout")
+    run_parser.add_argument("--scales", type=float, nargs="+", default=DEFAULT_SCALES)
+    run_parser.add_argument("--biomes", nargs="+", default=[biome.name.lower() for biome in DEFAULT_BIOMES])
+    run_parser.add_argument("--repeat", type=int, default=3)
+    run_parser.add_argument("--seed", type=int, default=1)
+    run_parser.add_argument("--cold", action="store_true", help="forget the tile images before every map")
+    run_parser.add_argument("--no-slice-cache", dest="slice_cache", action="store_false", help="cut a new image on every helpers.get_image")
+
+    compare_parser = commands.add_parser("compare", help="flag phases that got slower")
+    compare_parser.add_argument("old")
+    compare_parser.add_argument("new")
+    compare_parser.add_argument("--threshold", type=float, default=0.10, help="allowed slowdown, 0.1 is 10%%")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "compare":
+        with open(args.old) as f:
+            old = json.load(f)
+        with open(args.new) as f:
+            new = json.load(f)
+
+        regressions = compare(old, new, args.threshold)
+        for regression in regressions:
+            print(regression)
+        return 1 if regressions else 0
+
+    if args.command is None:
+        args = parser.parse_args(["run"])
+
+    c.SLICE_CACHE = args.slice_cache
+    start()
+    scales = [int(scale) if scale == int(scale) else scale for scale in args.scales]
+    biomes = [c.Biome[name.upper()] for name in args.biomes]
+    results = run(biomes, scales, args.repeat, args.seed, args.cold)
+
+    text = json.dumps(results, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,6 +2,7 @@
 
 from . import helpers
 from . import item
+from . import text
 
 from .. import constants as c
 from .. import setup
@@ -58,7 +59,7 @@ def render_description(self, surface: pygame.surface.Surface) -> None:
         offset = 5
 
         for ea in desc:
-            text_surf = self.font.render(ea, True, self.slot.item.color)
+            text_surf = text.render(self.font, ea, self.slot.item.color)
             text_rect = text_surf.get_rect(top=self.rect.top + offset, left=self.rect.left)
             texts[text_surf] = text_rect
 
@@ -0,0 +1,109 @@
+"""
+Shared animation frames.
+
+The player and every NPC walk with the same frames, so each frame is cut
+out of its sheet and scaled once, the first time it's asked for. Sprites
+keep a reference to the frames of their direction and a frame index.
+
+Shared frames must not be drawn on. Copy one first to change it.
+"""
+from typing import Dict, List, Tuple
+
+import pygame
+
+from . import helpers
+
+from .. import constants as c
+from .. import setup
+
+
+# (x, y, width, height) on the sheet.
+FrameRect = Tuple[int, int, int, int]
+
+# Walking frames of each sheet, by direction. The first frame is repeated,
+# frame 0 is a placeholder meaning that the animation hasn't ran yet.
+sheet_frames = {
+    "hero": {
+        c.Direction.UP: [
+            (79, 283, 98, 202),
+            (79, 283, 98, 202),
+            (335, 283, 98, 198),
+            (591, 283, 98, 202),
+            (847, 283, 98, 198),
+        ],
+        c.Direction.DOWN: [
+            (79, 27, 98, 202),
+            (79, 27, 98, 202),
+            (335, 27, 98, 198),
+            (591, 27, 98, 202),
+            (847, 27, 98, 198),
+        ],
+        c.Direction.LEFT: [
+            (67, 535, 106, 198),
+            (67, 535, 106, 198),
+            (323, 535, 106, 194),
+            (579, 535, 106, 198),
+            (835, 535, 106, 194),
+        ],
+        c.Direction.RIGHT: [
+            (83, 791, 106, 198),
+            (83, 791, 106, 198),
+            (339, 791, 106, 194),
+            (595, 791, 106, 198),
+            (851, 791, 106, 194),
+        ],
+    },
+} # type: Dict[str, Dict[c.Direction, List[FrameRect]]]
+
+# Diagonals walk with the frames of their side.
+direction_frames = {
+    c.Direction.LEFTUP: c.Direction.LEFT,
+    c.Direction.LEFTDOWN: c.Direction.LEFT,
+    c.Direction.RIGHTUP: c.Direction.RIGHT,
+    c.Direction.RIGHTDOWN: c.Direction.RIGHT,
+}
+
+
+# (sheet, direction, mult)
+Key = Tuple[str, c.Direction, float]
+
+_frames = {} # type: Dict[Key, Tuple[pygame.Surface, ...]]
+
+
+def get(sheet: str, direction: c.Direction, mult: float=1) -> Tuple[pygame.Surface, ...]:
+    """Frames of sheet walking in direction."""
+    direction = direction_frames.get(direction, direction)
+    key = (sheet, direction, mult)
+    frames = _frames.get(key)
+    if frames is None:
+        # Repeated rects share one surface.
+        images = {} # type: Dict[FrameRect, pygame.Surface]
+        for rect in sheet_frames[sheet][direction]:
+            if rect not in images:
+                # Kept here once converted, not in get_image's cache too.
+                images[rect] = _to_display_format(helpers.get_image(*rect, setup.GFX[sheet], mult, cache=False))
+        _frames[key] = frames = tuple(images[rect] for rect in sheet_frames[sheet][direction])
+
+    return frames
+
+
+def directions(sheet: str, mult: float=1) -> Dict[c.Direction, Tuple[pygame.Surface, ...]]:
+    """Frames of sheet for every direction it can walk in, diagonals
+    included."""
+    walking = list(sheet_frames[sheet]) + [diagonal for diagonal, side in direction_frames.items() if side in sheet_frames[sheet]]
+    return {direction: get(sheet, direction, mult) for direction in walking}
+
+
+def _to_display_format(image: pygame.Surface) -> pygame.Surface:
+    if pygame.display.get_surface() is None:
+        return image
+    return image.convert_alpha()
+
+
+def clear() -> None:
+    _frames.clear()
+
+
+def report() -> Tuple[int, int]:
+    """Number of distinct frames, and the bytes their pixels use."""
+    return helpers.surfaces_report(image for frames in _frames.values() for image in frames)
@@ -0,0 +1,233 @@
+"""
+Lookup table autotiler for water and grass edges.
+
+Every cell's 8-neighborhood is encoded as a bitmask. A table built once
+at import maps each of the 256 masks to:
+    - The tile name for a solid (water) cell.
+    - Whether the water should be swapped to grass instead.
+    - The corner cuts that cover grass corners poking into the water.
+
+The whole grid is then evaluated with array lookups, instead of running
+a chain of if/elif branches over eight neighbor reads per cell.
+"""
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .. import constants as c
+
+
+# Neighbor bits.
+UP = 1
+DOWN = 2
+LEFT = 4
+RIGHT = 8
+LEFTUP = 16
+RIGHTUP = 32
+LEFTDOWN = 64
+RIGHTDOWN = 128
+
+NUM_MASKS = 256
+
+
+WATER_CHOICES = {
+    c.Direction.UP: "water_top_grass",
+    c.Direction.DOWN: "water_bottom_grass",
+    c.Direction.LEFT: "water_left_grass",
+    c.Direction.RIGHT: "water_right_grass",
+    c.Direction.LEFTUP: "water_top_left_grass",
+    c.Direction.LEFTDOWN: "water_bottom_left_grass",
+    c.Direction.RIGHTUP: "water_top_right_grass",
+    c.Direction.RIGHTDOWN: "water_bottom_right_grass",
+    c.Direction.NONE: "water",
+}
+
+# Ex. Left Up means top left corner is grass.
+WATER_CORNERS = {
+    c.Direction.LEFTUP: "water_top_left_corner_grass",
+    c.Direction.LEFTDOWN: "water_bottom_left_corner_grass",
+    c.Direction.RIGHTUP: "water_top_right_corner_grass",
+    c.Direction.RIGHTDOWN: "water_bottom_right_corner_grass",
+}
+
+# A water cell by itself is changed to grass.
+SWAPPED_NAME = "grass"
+
+# Corner cuts are named by the corner of the tile they cover.
+# Value: (move and flip x, move and flip y)
+CORNER_CUTS = {
+    c.Direction.LEFTUP: (False, False),
+    c.Direction.RIGHTUP: (True, False),
+    c.Direction.LEFTDOWN: (False, True),
+    c.Direction.RIGHTDOWN: (True, True),
+}
+
+
+def classify(mask: int) -> Tuple[str, bool, Tuple[c.Direction, ...]]:
+    """Choose a solid tilename based on surroundings.
+
+    :returns Tuple: tilename, swapped, corners
+    :returns tilename: Tilename
+    :returns swapped: If the tile should be swapped from solid (1) to empty (0)
+    :returns corners: Corner cuts to draw over the tile
+    """
+    up = mask & UP
+    down = mask & DOWN
+    left = mask & LEFT
+    right = mask & RIGHT
+    leftup = mask & LEFTUP
+    rightup = mask & RIGHTUP
+    leftdown = mask & LEFTDOWN
+    rightdown = mask & RIGHTDOWN
+
+    water = WATER_CHOICES[c.Direction.NONE]
+    corners = [] # type: List[c.Direction]
+
+    def cut(needed: bool, corner: c.Direction) -> None:
+        if needed:
+            corners.append(corner)
+
+    if up and down and left and right:
+        # Four sides are covered
+        # Check corner cases first, literally.
+        if leftup and rightup and leftdown and rightdown:
+            # All sides are covered.
+            return water, False, ()
+
+        # 2 Opposite corners are not solid.
+        elif not leftup and not rightdown:
+            return water, False, (c.Direction.LEFTUP, c.Direction.RIGHTDOWN)
+        elif not leftdown and not rightup:
+            return water, False, (c.Direction.LEFTDOWN, c.Direction.RIGHTUP)
+
+        # All four sides are covered, and 1 corner is not.
+        elif leftup and rightup and leftdown and not rightdown:
+            return WATER_CORNERS[c.Direction.RIGHTDOWN], False, ()
+        elif leftup and rightup and not leftdown and rightdown:
+            return WATER_CORNERS[c.Direction.LEFTDOWN], False, ()
+        elif leftup and not rightup and leftdown and rightdown:
+            return WATER_CORNERS[c.Direction.RIGHTUP], False, ()
+        elif not leftup and rightup and leftdown and rightdown:
+            return WATER_CORNERS[c.Direction.LEFTUP], False, ()
+
+        return water, False, ()
+
+    # 3 water side tiles
+    elif down and left and right and not up:
+        # UP GRASS
+        cut(not leftdown, c.Direction.LEFTDOWN)
+        cut(not rightdown, c.Direction.RIGHTDOWN)
+        return WATER_CHOICES[c.Direction.UP], False, tuple(corners)
+    elif up and left and right and not down:
+        # DOWN GRASS
+        cut(not leftup, c.Direction.LEFTUP)
+        cut(not rightup, c.Direction.RIGHTUP)
+        return WATER_CHOICES[c.Direction.DOWN], False, tuple(corners)
+    elif up and down and right and not left:
+        # LEFT GRASS
+        cut(not rightdown, c.Direction.RIGHTDOWN)
+        cut(not rightup, c.Direction.RIGHTUP)
+        return WATER_CHOICES[c.Direction.LEFT], False, tuple(corners)
+    elif up and down and left and not right:
+        # RIGHT GRASS
+        cut(not leftdown, c.Direction.LEFTDOWN)
+        cut(not leftup, c.Direction.LEFTUP)
+        return WATER_CHOICES[c.Direction.RIGHT], False, tuple(corners)
+
+    # 2 water side tiles
+    elif not right and not up and left and down:
+        cut(not leftdown, c.Direction.LEFTDOWN)
+        return WATER_CHOICES[c.Direction.RIGHTUP], False, tuple(corners)
+    elif not left and not up and right and down:
+        cut(not rightdown, c.Direction.RIGHTDOWN)
+        return WATER_CHOICES[c.Direction.LEFTUP], False, tuple(corners)
+    elif not right and not down and left and up:
+        cut(not leftup, c.Direction.LEFTUP)
+        return WATER_CHOICES[c.Direction.RIGHTDOWN], False, tuple(corners)
+    elif not left and not down and right and up:
+        cut(not rightup, c.Direction.RIGHTUP)
+        return WATER_CHOICES[c.Direction.LEFTDOWN], False, tuple(corners)
+
+    # GENIUS! If a water is by itself, change it to grass!
+    return SWAPPED_NAME, True, ()
+
+
+def _build_tables() -> Tuple[List[str], np.ndarray, np.ndarray, List[Tuple[c.Direction, ...]]]:
+    names = [] # type: List[str]
+    name_indices = {} # type: Dict[str, int]
+
+    tile_table = np.zeros(NUM_MASKS, dtype=np.uint8)
+    swap_table = np.zeros(NUM_MASKS, dtype=np.bool_)
+    corner_table = [] # type: List[Tuple[c.Direction, ...]]
+
+    for mask in range(NUM_MASKS):
+        name, swapped, corners = classify(mask)
+        if name not in name_indices:
+            name_indices[name] = len(names)
+            names.append(name)
+
+        tile_table[mask] = name_indices[name]
+        swap_table[mask] = swapped
+        corner_table.append(corners)
+
+    return names, tile_table, swap_table, corner_table
+
+
+TILE_NAMES, TILE_TABLE, SWAP_TABLE, CORNER_TABLE = _build_tables()
+
+
+def neighbor_masks(cells: np.ndarray, outside: Optional[int]=None) -> np.ndarray:
+    """Encode the 8-neighborhood of every cell. ``cells`` is indexed [x, y].
+
+    :param outside: Value of every point outside of cells. When None,
+    edges behave the way the map's neighbor reads always have:
+        - One step left or up wraps around to the opposite edge.
+        - On the bottom row only the cell above is read.
+        - On the right column only the cells above and below are read.
+    """
+    width, height = cells.shape
+    solid = (cells != 0).astype(np.uint8)
+
+    if outside is None:
+        # shifted(dx, dy)[x, y] == solid[x + dx, y + dy], wrapping around.
+        def shifted(dx: int, dy: int) -> np.ndarray:
+            return np.roll(solid, (-dx, -dy), axis=(0, 1))
+    else:
+        padded = np.pad(solid, 1, mode="constant", constant_values=int(outside != 0))
+
+        def shifted(dx: int, dy: int) -> np.ndarray:
+            return padded[1 + dx:1 + dx + width, 1 + dy:1 + dy + height]
+
+    masks = shifted(0, -1) * UP
+    masks |= shifted(0, 1) * DOWN
+    masks |= shifted(-1, 0) * LEFT
+    masks |= shifted(1, 0) * RIGHT
+    masks |= shifted(-1, -1) * LEFTUP
+    masks |= shifted(1, -1) * RIGHTUP
+    masks |= shifted(-1, 1) * LEFTDOWN
+    masks |= shifted(1, 1) * RIGHTDOWN
+
+    if outside is None:
+        masks[width - 1, :] &= UP | DOWN
+        masks[:, height - 1] &= UP
+
+    return masks
+
+
+def settle(cells: np.ndarray, outside: Optional[int]=None) -> np.ndarray:
+    """Swap lone water to grass until nothing else needs swapping.
+
+    Swaps only ever remove water, and removing water never saves another
+    cell from being swapped, so the result doesn't depend on the order
+    the swaps are done in. ``cells`` is modified in place.
+
+    :param outside: See neighbor_masks.
+    :returns: The neighbor masks of the settled grid.
+    """
+    while True:
+        masks = neighbor_masks(cells, outside)
+        swaps = (cells != 0) & SWAP_TABLE[masks]
+        if not swaps.any():
+            return masks
+
+        cells[swaps] = 0
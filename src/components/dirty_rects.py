@@ -0,0 +1,84 @@
+"""
+Dirty rectangle display updates.
+
+With c.DIRTY_RECTS on, only the parts of the screen that changed are sent
+to the display. Whatever draws to the screen marks the rects it changed,
+and the game loop flushes them once a frame. Marking everything, like
+when the camera scrolls, falls back to updating the whole display.
+
+Things drawn over the world, like the HUD, repaint the world under them
+from the background before drawing, so they don't pile up on the screen
+in frames where the world isn't drawn again.
+"""
+from typing import List, Optional
+
+import pygame
+
+from .. import constants as c
+
+
+# Updating this much of the screen in pieces isn't worth it.
+MAX_DIRTY_FRACTION = 0.5
+
+_rects = [] # type: List[pygame.Rect]
+_everything = True
+
+# What the screen looks like under the UI.
+_background = None # type: Optional[pygame.Surface]
+
+
+def mark(rect: pygame.Rect) -> None:
+    if c.DIRTY_RECTS and not _everything:
+        _rects.append(pygame.rect.Rect(rect))
+
+
+def mark_all() -> None:
+    global _everything
+    _everything = True
+    _rects.clear()
+
+
+def set_background(surface: Optional[pygame.Surface]) -> None:
+    """
+    :param surface: Screen sized surface, or None when there is nothing
+                    under the UI that isn't drawn again every frame.
+    """
+    global _background
+    _background = surface
+
+
+def repaint(surface: pygame.Surface, rect: pygame.Rect) -> None:
+    """Draw the background under rect again. Doesn't mark it."""
+    if c.DIRTY_RECTS and _background is not None:
+        surface.blit(_background, rect, rect)
+
+
+def merge(rects: List[pygame.Rect]) -> List[pygame.Rect]:
+    """Union overlapping rects, until none of them overlap."""
+    merged = [] # type: List[pygame.Rect]
+    for rect in rects:
+        rect = pygame.rect.Rect(rect)
+        index = rect.collidelist(merged)
+        while index != -1:
+            rect.union_ip(merged.pop(index))
+            index = rect.collidelist(merged)
+        merged.append(rect)
+
+    return merged
+
+
+def flush() -> None:
+    """Update the display with everything marked since the last flush."""
+    global _everything
+    if not c.DIRTY_RECTS or _everything:
+        pygame.display.update()
+    elif _rects:
+        rects = merge(_rects)
+        width, height = pygame.display.get_surface().get_size()
+        if sum(rect.width * rect.height for rect in rects) > width * height * MAX_DIRTY_FRACTION:
+            pygame.display.update()
+        else:
+            pygame.display.update(rects)
+
+    _rects.clear()
+    _everything = False
@@ -0,0 +1,341 @@
+"""
+Map generation, as plain data.
+
+Grids are carved out with a cellular automaton. The whole grid is stepped
+at once. Neighbors are counted by summing the eight shifted views of a
+padded copy of the grid, and the cell rules are written into a separate
+buffer, so no cell ever sees a neighbor that was already updated during
+the same step.
+
+Tiles and scenery are then chosen for every cell and stored in a MapData.
+Nothing here creates sprites or surfaces, the tilemap does that from the
+MapData.
+
+Grids are indexed the same way as ``Map.grid``: ``grid[x][y]``, which
+means the array shape is (width, height).
+"""
+from typing import Any, List, Optional, Tuple
+
+import random
+
+import numpy as np
+
+from . import autotile
+from . import grid
+
+from .. import constants as c
+
+
+# Bump when the same seed would generate a different map, like when
+# the rules, the random calls or the tile names change. Cached maps of
+# other versions are ignored.
+GENERATOR_VERSION = 1
+
+# Seeds are kept to this many bits, so the map cache can store them.
+SEED_MASK = 0xFFFFFFFF
+
+# Out of bounds neighbors count as alive, which keeps the map edges solid.
+OUT_OF_BOUNDS = 1
+
+# cellular automata values
+NUM_SIM_STEPS = 4
+DEATH_LIMIT = 4
+BIRTH_LIMIT = 6
+
+# Position 0 = default
+# Position 1 = fill
+biome_tile_names = {
+    c.Biome.FARMLAND: [
+        "grass",
+        "water",
+    ],
+    c.Biome.CAVE: [
+        "lightbrown_brick",
+        "black_brick",
+    ],
+}
+
+grass_names = [
+    "grass",
+    "grass2",
+]
+
+bush_names = [
+    "small_green_bush",
+    "small_forest_green_bush",
+    "small_brown_bush",
+    "green_bush",
+    "brown_bush",
+]
+
+tree_name_pairs = [
+    ["small_brown_treebottom", "small_brown_treetop"],
+    ["brown_treebottom", "brown_treetop"],
+    ["small_green_treebottom", "small_green_treetop"],
+    ["green_treebottom", "green_treetop"],
+]
+
+def _collect_tile_names() -> List[str]:
+    names = [] # type: List[str]
+    for biome_names in biome_tile_names.values():
+        names.extend(biome_names)
+    names.extend(grass_names)
+    names.extend(autotile.TILE_NAMES)
+
+    # Remove duplicates, keep the order.
+    return sorted(set(names), key=names.index)
+
+
+# Every tile name a map can hold. MapData.tiles stores indices into this.
+tile_names = _collect_tile_names()
+tile_name_indices = {name: i for i, name in enumerate(tile_names)}
+
+
+# Scenery kinds.
+BUSH = "bush"
+TREE = "tree"
+FENCE_LINK = "fence_link"
+FENCE_END = "fence_end"
+
+
+class MapData:
+    """Everything needed to build a map.
+
+    scenery: (kind, gridx, gridy, variant) where variant indexes
+             bush_names or tree_name_pairs.
+    corners: (gridx, gridy, corner direction) water corner cuts.
+    """
+    def __init__(self, width: int, height: int, biome: c.Biome) -> None:
+        self.width = width
+        self.height = height
+        self.biome = biome
+
+        # Seed the map was generated from, when it was.
+        self.seed = None # type: Optional[int]
+
+        self.grid = grid.Grid(width, height)
+        # Use this grid the same as the map grid.
+        # But instead of 1 being water, make 1 represent a collidable.
+        self.collidable_grid = grid.Grid(width, height)
+        self.tiles = grid.Grid(width, height)
+
+        self.scenery = [] # type: List[Tuple[str, int, int, int]]
+        self.corners = [] # type: List[Tuple[int, int, c.Direction]]
+
+
+    def tile_name(self, x: int, y: int) -> str:
+        return tile_names[self.tiles.get_unchecked(x, y)]
+
+
+def random_grid(width: int, height: int, rng: np.random.RandomState) -> np.ndarray:
+    """Initialize a grid with random values. 80% chance a 1 will occur."""
+    return (rng.randint(0, 5, size=(width, height)) != 0).astype(np.uint8)
+
+
+def count_alive_neighbors(grid: np.ndarray) -> np.ndarray:
+    """Returns the number of alive cells around every point of the grid."""
+    width, height = grid.shape
+    padded = np.pad(grid, 1, mode="constant", constant_values=OUT_OF_BOUNDS)
+
+    counts = np.zeros((width, height), dtype=np.uint8)
+    for i in range(3):
+        for j in range(3):
+            if i == 1 and j == 1:
+                continue
+            counts += padded[i:i + width, j:j + height]
+
+    return counts
+
+
+def simulation_step(grid: np.ndarray, death_limit: int, birth_limit: int, out: Optional[np.ndarray]=None) -> np.ndarray:
+    """Run one step of the automaton and write the result into ``out``.
+
+    Cell rules.
+    DL - Death limit
+    BL - Birth limit
+    Living cell has less than DL living neighbors: dies.
+    Living cell has DL up to BL living neighbors: lives.
+    Living cell has more than BL living neighbors: dies.
+    Dead cell has more than BL living neighbors: lives.
+    """
+    if out is None:
+        out = np.empty_like(grid)
+
+    neighbors = count_alive_neighbors(grid)
+    alive = grid != 0
+
+    lives = alive & (neighbors >= death_limit) & (neighbors <= birth_limit)
+    born = ~alive & (neighbors > birth_limit)
+
+    np.logical_or(lives, born, out=out, casting="unsafe")
+    return out
+
+
+def simulate(grid: np.ndarray, steps: int, death_limit: int, birth_limit: int) -> np.ndarray:
+    """Run the automaton for a number of steps, swapping between two buffers.
+
+    The given grid is used as one of the two buffers, so it is overwritten.
+    """
+    front = grid
+    back = np.empty_like(grid)
+
+    for _ in range(steps):
+        simulation_step(front, death_limit, birth_limit, out=back)
+        front, back = back, front
+
+    return front
+
+
+def generate(width: int, height: int, biome: c.Biome, rng: Any) -> MapData:
+    """Generate a whole map.
+
+    :param rng: random.Random, or anything with the same methods.
+    """
+    data = MapData(width, height, biome)
+
+    # Seed numpy from rng, so that one seed reproduces the whole map.
+    np_rng = np.random.RandomState(rng.getrandbits(32))
+    cells = random_grid(width, height, np_rng)
+    data.grid.array[:, :] = simulate(cells, NUM_SIM_STEPS, DEATH_LIMIT, BIRTH_LIMIT)
+
+    masks = None
+    if biome == c.Biome.FARMLAND:
+        # Swapping lone water to grass is only done for farmland,
+        # for now. Settle the swaps before choosing tiles.
+        masks = autotile.settle(data.grid.array)
+
+    place(data, masks, rng)
+    return data
+
+
+def generate_seeded(width: int, height: int, biome: c.Biome, seed: int) -> MapData:
+    """Generate a whole map with its own rng, the same seed always gives
+    the same map. Only the low 32 bits of seed are used."""
+    seed &= SEED_MASK
+    data = generate(width, height, biome, random.Random(seed))
+    data.seed = seed
+    return data
+
+
+def place(data: MapData, masks: Optional[np.ndarray], rng: Any) -> None:
+    """Choose tiles, corner cuts and scenery for every cell of the grid.
+
+    Calculate tile names based on surroundings:
+        If a tile is surrounded by solid points:
+            Is full water image.
+        If a tile has only water to it's left:
+            Water and left grass image.
+        Etc.
+    """
+    names = biome_tile_names[data.biome]
+    cells = data.grid.tolist()
+
+    if data.biome == c.Biome.FARMLAND:
+        # Look up every solid tile at once, then read back per cell.
+        solid_indices = autotile.TILE_TABLE[masks].tolist()
+        mask_lists = masks.tolist()
+
+    for gridy in range(data.height):
+        for gridx in range(data.width):
+            grid_point = cells[gridx][gridy]
+            solid_grid_point = grid_point == 1
+            tile_name = names[grid_point]
+
+            created_tree = False
+
+            # Select names based on biome.
+            if data.biome == c.Biome.FARMLAND:
+                if solid_grid_point:
+                    tile_name = autotile.TILE_NAMES[solid_indices[gridx][gridy]]
+                    for corner in autotile.CORNER_TABLE[mask_lists[gridx][gridy]]:
+                        data.corners.append((gridx, gridy, corner))
+                else:
+                    # Create a variety of grasses.
+                    tile_name = grass_names[rng.randint(0, len(grass_names) - 1)]
+
+                    created_tree = _place_tree(data, gridx, gridy, rng)
+
+                    if not created_tree:
+                        # Don't draw bushes under trees.
+                        _place_bush(data, gridx, gridy, rng)
+
+                _place_fence(data, cells, gridx, gridy, rng)
+
+            if solid_grid_point or created_tree:
+                data.collidable_grid.set_unchecked(gridx, gridy, 1)
+
+            data.tiles.set_unchecked(gridx, gridy, tile_name_indices[tile_name])
+
+
+def _place_bush(data: MapData, gridx: int, gridy: int, rng: Any) -> bool:
+    """
+    Chance to create the object = 1 / density
+    """
+    density = c.BUSH_DENSITY
+    choice = rng.randint(1, density)
+    variant = rng.randint(0, len(bush_names) - 1)
+
+    if choice == 1:
+        data.scenery.append((BUSH, gridx, gridy, variant))
+        return True
+
+    return False
+
+
+def _place_tree(data: MapData, gridx: int, gridy: int, rng: Any) -> bool:
+    """
+    Chance to create the object = 1 / density
+    """
+    density = c.TREE_DENSITY
+    choice = rng.randint(1, density)
+    variant = rng.randint(0, len(tree_name_pairs) - 1)
+
+    if choice == 1:
+        data.scenery.append((TREE, gridx, gridy, variant))
+        return True
+
+    return False
+
+
+def _place_fence(data: MapData, cells: List[List[int]], gridx: int, gridy: int, rng: Any) -> bool:
+    """
+    Chance to create the object = 1 / density
+
+    Fences run to the right, and end on the last open point before
+    something solid or the edge of the grid.
+    """
+    density = c.FENCE_DENSITY
+    choice = rng.randint(1, density)
+
+    created = False
+    if choice == 1:
+        num_links = rng.randint(c.MIN_FENCE_LENGTH, c.MAX_FENCE_LENGTH)
+
+        for fence_index in range(num_links):
+            current_point = 1   # Assume point is taken, at first.
+            next_point = 1      # Assume point is taken, at first.
+            try:
+                current_point = cells[gridx][gridy]
+                next_point = cells[gridx + 1][gridy]
+            except IndexError:
+                pass
+
+            if (current_point == 0 and next_point == 1) or (current_point == 0 and fence_index == num_links - 1):
+                # Current point is good but the next one is solid,
+                # assume the fence ends here.
+                data.scenery.append((FENCE_END, gridx, gridy, 0))
+                data.collidable_grid.set_unchecked(gridx, gridy, 1)
+                created = True
+                break
+            elif current_point == 0 and next_point == 0:
+                # Current point and the next right point are available.
+                data.scenery.append((FENCE_LINK, gridx, gridy, 0))
+                data.collidable_grid.set_unchecked(gridx, gridy, 1)
+                created = True
+            elif current_point == 1:
+                # Current point solid. Don't create anything.
+                break
+
+            gridx += 1
+
+    return created
@@ -0,0 +1,162 @@
+"""
+Compact storage for map grids.
+
+A grid holds one small int (0-255) per cell in a single bytearray, instead
+of a list of lists of Python ints. Cells are stored column by column, so
+``grid.get(x, y)`` lines up with the ``grid[x][y]`` indexing the map has
+always used, and the NumPy view of the same memory has the shape
+(width, height).
+"""
+from typing import Iterator, List, Tuple
+
+import numpy as np
+
+
+class Grid:
+    def __init__(self, width: int, height: int, fill: int=0) -> None:
+        self.width = width
+        self.height = height
+
+        self.__cells = bytearray([fill]) * (width * height)
+
+        # Shares memory with the bytearray. Use it for bulk operations.
+        self.array = np.frombuffer(self.__cells, dtype=np.uint8).reshape(width, height)
+
+
+    @classmethod
+    def from_array(cls, array: np.ndarray) -> "Grid":
+        width, height = array.shape
+        grid = cls(width, height)
+        grid.array[:, :] = array
+        return grid
+
+
+    @classmethod
+    def from_bytes(cls, width: int, height: int, cells: bytes) -> "Grid":
+        """Create a grid from raw cells, column by column, like buffer()."""
+        if len(cells) != width * height:
+            raise ValueError("expected {} cells, got {}".format(width * height, len(cells)))
+
+        grid = cls.__new__(cls)
+        grid.__setstate__((width, height, cells))
+        return grid
+
+
+    @classmethod
+    def from_lists(cls, lists: List[List[int]]) -> "Grid":
+        """Create a grid from a list of lists indexed [x][y]."""
+        return cls.from_array(np.array(lists, dtype=np.uint8))
+
+
+    def __len__(self) -> int:
+        return self.width
+
+
+    def __getitem__(self, x: int) -> memoryview:
+        """Column access, so ``grid[x][y]`` behaves like the old lists of
+        lists, negative indices included. Prefer get and set."""
+        if x < 0:
+            x += self.width
+        if not 0 <= x < self.width:
+            raise IndexError("grid column out of range")
+
+        return self.column(x)
+
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Grid):
+            return NotImplemented
+        return self.width == other.width and self.height == other.height and self.__cells == other.__cells
+
+
+    def in_bounds(self, x: int, y: int) -> bool:
+        return 0 <= x < self.width and 0 <= y < self.height
+
+
+    def get(self, x: int, y: int) -> int:
+        """Bounds checked read. Raises IndexError outside of the grid."""
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.__cells[x * self.height + y]
+        raise IndexError("grid point ({}, {}) out of range".format(x, y))
+
+
+    def set(self, x: int, y: int, value: int) -> None:
+        """Bounds checked write. Raises IndexError outside of the grid."""
+        if 0 <= x < self.width and 0 <= y < self.height:
+            self.__cells[x * self.height + y] = value
+        else:
+            raise IndexError("grid point ({}, {}) out of range".format(x, y))
+
+
+    def get_unchecked(self, x: int, y: int) -> int:
+        """Read without bounds checks, for loops that already stay inside
+        the grid. Out of range points read the wrong cell or raise."""
+        return self.__cells[x * self.height + y]
+
+
+    def set_unchecked(self, x: int, y: int, value: int) -> None:
+        self.__cells[x * self.height + y] = value
+
+
+    def column(self, x: int) -> memoryview:
+        """Writable view of all the cells with the same x."""
+        start = x * self.height
+        return memoryview(self.__cells)[start:start + self.height]
+
+
+    def row(self, y: int) -> np.ndarray:
+        """Writable view of all the cells with the same y."""
+        return self.array[:, y]
+
+
+    def region(self, x: int, y: int, width: int, height: int) -> np.ndarray:
+        """Writable view of a rectangle of cells, clipped to the grid."""
+        x0, y0 = max(x, 0), max(y, 0)
+        return self.array[x0:x + width, y0:y + height]
+
+
+    def points(self, value: int) -> Iterator[Tuple[int, int]]:
+        """Every (x, y) that holds value."""
+        for x, y in np.argwhere(self.array == value):
+            yield int(x), int(y)
+
+
+    def count(self, value: int) -> int:
+        return int(np.count_nonzero(self.array == value))
+
+
+    def fill(self, value: int) -> None:
+        self.array.fill(value)
+
+
+    def copy(self) -> "Grid":
+        grid = Grid(self.width, self.height)
+        grid.__cells[:] = self.__cells
+        return grid
+
+
+    def buffer(self) -> memoryview:
+        """Buffer protocol export of the raw cells, column by column."""
+        return memoryview(self.__cells)
+
+
+    def tolist(self) -> List[List[int]]:
+        return self.array.tolist()
+
+
+    def __getstate__(self) -> Tuple[int, int, bytes]:
+        # The array view can't be pickled along with the bytearray,
+        # it would come back as a copy.
+        return self.width, self.height, bytes(self.__cells)
+
+
+    def __setstate__(self, state: Tuple[int, int, bytes]) -> None:
+        self.width, self.height, cells = state
+        self.__cells = bytearray(cells)
+        self.array = np.frombuffer(self.__cells, dtype=np.uint8).reshape(self.width, self.height)
+
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        if dtype is None or np.dtype(dtype) == self.array.dtype:
+            return self.array
+        return self.array.astype(dtype)
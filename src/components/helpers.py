@@ -1,10 +1,39 @@
-from typing import Tuple
+"""
+Cutting images out of sprite sheets.
+
+get_image keeps every image it cuts, by its Slice, and hands the same
+surface out again for the same arguments. Cached images are shared and
+must not be drawn on. Callers that change the image they get pass
+cache=False, or copy it.
+"""
+from typing import Dict, Iterable, NamedTuple, Tuple
 
 import pygame
 
 from .. import constants as c
 
 
+Slice = NamedTuple("Slice", [
+    # The sheet itself. The cache holds on to it, so another sheet can't
+    # end up with its id.
+    ("sprite_sheet", pygame.Surface),
+    ("x", int),
+    ("y", int),
+    ("width", int),
+    ("height", int),
+    ("mult", float),
+    ("y_mult", float),
+    ("colorkey", Tuple[int, int, int]),
+    ("transparent", bool),
+])
+
+_images = {} # type: Dict[Slice, pygame.Surface]
+
+# Cache hits and misses of get_image.
+hits = 0
+misses = 0
+
+
 def get_image(
         x: int,
         y: int,
@@ -14,8 +43,42 @@ def get_image(
         mult: float=1,
         y_mult: float=None,
         colorkey: Tuple[int, int, int]=c.BLACK,
-        transparent: bool=True) -> pygame.Surface:
-    """Extracts from the sprite sheet, or just the sprite."""
+        transparent: bool=True,
+        cache: bool=True) -> pygame.Surface:
+    """Extracts from the sprite sheet, or just the sprite.
+
+    :param cache: Share the image with every call with the same arguments.
+                  Pass False to get an image of its own, to draw on.
+    """
+    global hits, misses
+    if y_mult is None:
+        y_mult = mult
+
+    if not (cache and c.SLICE_CACHE):
+        return cut_image(x, y, width, height, sprite_sheet, mult, y_mult, colorkey, transparent)
+
+    key = Slice(sprite_sheet, x, y, width, height, mult, y_mult, tuple(colorkey), transparent)
+    image = _images.get(key)
+    if image is not None:
+        hits += 1
+        return image
+
+    misses += 1
+    _images[key] = image = cut_image(x, y, width, height, sprite_sheet, mult, y_mult, colorkey, transparent)
+    return image
+
+
+def cut_image(
+        x: int,
+        y: int,
+        width: int,
+        height: int,
+        sprite_sheet: pygame.Surface,
+        mult: float,
+        y_mult: float,
+        colorkey: Tuple[int, int, int],
+        transparent: bool) -> pygame.Surface:
+    """Same as get_image, always a new image."""
     if transparent:
         # For images without transparency in them
         image = pygame.Surface((width, height), pygame.SRCALPHA, 32)
@@ -29,8 +92,23 @@ def get_image(
 
     #image.set_colorkey(colorkey)
 
-    if y_mult is None:
-        y_mult = mult
     size_delta = (int(rect.width * mult), int(rect.height * y_mult))
     image = pygame.transform.scale(image, size_delta)
     return image
+
+
+def clear() -> None:
+    """Forget every cached image, and the sheets they were cut from."""
+    _images.clear()
+
+
+def report() -> Tuple[int, int]:
+    """Number of cached images, and the bytes their pixels use."""
+    return surfaces_report(_images.values())
+
+
+def surfaces_report(images: Iterable[pygame.Surface]) -> Tuple[int, int]:
+    """Number of distinct surfaces, and the bytes their pixels use."""
+    distinct = {id(image): image for image in images}
+    size = sum(image.get_width() * image.get_height() * image.get_bytesize() for image in distinct.values())
+    return len(distinct), size
@@ -2,6 +2,7 @@
 
 import pygame
 
+from . import dirty_rects
 from . import item
 from . import Tooltip
 
@@ -310,6 +311,10 @@ def __init__(self) -> None:
         #self.__items = self.__create_items()
         self.__items = None
 
+        # Rects drawn outside of the panel last frame, like dragged items.
+        self.__overlays = [] # type: List[pygame.rect.Rect]
+        self.__last_mouse_pos = None # type: Optional[Tuple[int, int]]
+
 
     # XXX: Later the items will be created on a random chance
     #      when gathering nodes, and should be placed in the next
@@ -393,16 +398,27 @@ def switch(self) -> None:
 
 
     def update(self, screen: pygame.Surface, inp: binds.Input, item: item.Item) -> None:
+        was_open = self.__open
         self.handle_state(inp)
 
         if item:
             self.add_item(item)
 
+        for rect in self.__overlays:
+            dirty_rects.repaint(screen, rect)
+            dirty_rects.mark(rect)
+        self.__overlays = []
+
+        if was_open and not self.__open:
+            dirty_rects.repaint(screen, self.__panel.rect)
+            dirty_rects.mark(self.__panel.rect)
+
         if self.__open:
             self.__panel.update(screen)
             self.slot_mesh.update(screen, inp)
             self.item_group.draw(screen)
             self.slot_mesh.update_tooltip(screen)
+            self.mark_dirty(inp, item, was_open)
 
         if setup.screen_size.changed():
             self.last_flat_slots = self.slot_mesh.flat_slots
@@ -410,6 +426,25 @@ def update(self, screen: pygame.Surface, inp: binds.Input, item: item.Item) -> N
             self.__move_items()
 
 
+    def mark_dirty(self, inp: binds.Input, item: item.Item, was_open: bool) -> None:
+        """Mark the panel when anything in it could have changed, and
+        whatever was drawn outside of it."""
+        panel_rect = self.__panel.rect
+        mouse_moved = inp.mouse_pos() != self.__last_mouse_pos
+        self.__last_mouse_pos = inp.mouse_pos()
+        if item or not was_open or mouse_moved or inp.last_mouse_click() or inp.last_mouse_drop():
+            dirty_rects.mark(panel_rect)
+
+        for sprite in self.item_group:
+            if not panel_rect.contains(sprite.rect):
+                self.__overlays.append(pygame.rect.Rect(sprite.rect))
+        if self.slot_mesh.tt:
+            self.__overlays.append(pygame.rect.Rect(self.slot_mesh.tt.rect))
+
+        for rect in self.__overlays:
+            dirty_rects.mark(rect)
+
+
     def handle_state(self, inp: binds.Input) -> None:
         if inp.pressed("toggle_panel"):
             self.switch()
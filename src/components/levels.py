@@ -0,0 +1,87 @@
+"""
+Background level generation.
+
+Levels are generated in worker processes, ahead of the time they are
+needed. Workers only build MapData, which is plain data and can be
+pickled back to the game. Sprites and surfaces are made from it on the
+main thread, by tilemap.Map.
+
+The workers only save time. When a level can't be had from them, the
+pool is broken or the worker failed, the game generates it itself.
+"""
+from typing import Optional
+
+from concurrent import futures
+import multiprocessing
+import random
+import traceback
+
+from . import generation
+from . import map_cache
+
+from .. import constants as c
+
+
+def generate(width: int, height: int, biome: c.Biome, seed: int, cache: bool) -> generation.MapData:
+    """Runs in a worker process. Workers import constants again, so
+    settings changed in the game are passed in, like cache."""
+    return map_cache.generate(width, height, biome, seed, cache=cache)
+
+
+class LevelGenerator:
+    """
+    Generate levels in a process pool.
+
+    Intended to be stored in the GameInfo object, like the item generator.
+    Call ```submit``` to get a future of the MapData for a new level.
+    """
+    def __init__(self, max_workers: int=c.LEVEL_WORKERS) -> None:
+        self.max_workers = max_workers
+
+        # Created on the first submit, so nothing is started for states
+        # that never generate levels.
+        self.__executor = None # type: Optional[futures.ProcessPoolExecutor]
+
+
+    def submit(self, width: int, height: int, biome: c.Biome, seed: Optional[int]=None) -> Optional[futures.Future]:
+        """None when the pool can't take the level."""
+        # Only a seed given again is worth caching.
+        cache = c.MAP_CACHE and seed is not None
+        if seed is None:
+            seed = random.getrandbits(32)
+
+        if self.__executor is None:
+            # Don't fork, the game has threads running that the workers
+            # would get a broken copy of.
+            context = multiprocessing.get_context("spawn")
+            self.__executor = futures.ProcessPoolExecutor(self.max_workers, mp_context=context)
+
+        try:
+            return self.__executor.submit(generate, width, height, biome, seed, cache)
+        except (futures.BrokenExecutor, RuntimeError):
+            traceback.print_exc()
+            # Start a new pool for the next level.
+            self.cleanup()
+            return None
+
+
+    def cleanup(self) -> None:
+        if self.__executor is not None:
+            self.__executor.shutdown(wait=False)
+            self.__executor = None
+
+
+def result(future: Optional[futures.Future], timeout: float=c.LEVEL_TIMEOUT) -> Optional[generation.MapData]:
+    """The MapData of a submitted level, or None when it failed or isn't
+    done within timeout seconds."""
+    if future is None:
+        return None
+
+    try:
+        return future.result(timeout)
+    except futures.TimeoutError:
+        future.cancel()
+        print("Level generation took longer than {} seconds.".format(timeout))
+    except Exception:
+        traceback.print_exc()
+    return None
@@ -0,0 +1,181 @@
+"""
+On-disk cache of generated maps.
+
+A map is fully decided by its seed, biome, size and the version of the
+generator, so those make up the file name. The file holds the finished
+MapData in a compact binary format:
+
+    header
+    grid             width * height bytes, column by column
+    collidable grid  width * height bytes
+    tiles            width * height bytes, indices into generation.tile_names
+    scenery          (kind, x, y, variant) records
+    corners          (x, y, direction) records
+
+Loading a cached map skips generation entirely, the grids are read
+straight back into Grid buffers.
+"""
+from typing import Optional
+
+import os
+import struct
+
+import numpy as np
+
+from . import generation
+from . import grid
+
+from .. import constants as c
+
+
+CACHE_DIR = os.path.join("cache", "maps")
+
+# Bump when the layout of the file changes.
+FORMAT_VERSION = 1
+MAGIC = b"GMAP"
+
+HEADER = struct.Struct("<4sHHIIIBII")
+
+SCENERY_KINDS = [
+    generation.BUSH,
+    generation.TREE,
+    generation.FENCE_LINK,
+    generation.FENCE_END,
+]
+
+SCENERY_DTYPE = np.dtype([("kind", "u1"), ("x", "<u4"), ("y", "<u4"), ("variant", "u1")])
+CORNER_DTYPE = np.dtype([("x", "<u4"), ("y", "<u4"), ("direction", "u1")])
+
+
+def cache_path(seed: int, biome: c.Biome, width: int, height: int, directory: str=CACHE_DIR) -> str:
+    name = "{:08x}_{}_{}x{}_v{}.map".format(seed, biome.name.lower(), width, height, generation.GENERATOR_VERSION)
+    return os.path.join(directory, name)
+
+
+def dumps(data: generation.MapData) -> bytes:
+    header = HEADER.pack(
+        MAGIC, FORMAT_VERSION, generation.GENERATOR_VERSION, data.seed,
+        data.width, data.height, data.biome.value,
+        len(data.scenery), len(data.corners))
+
+    scenery = np.array(
+        [(SCENERY_KINDS.index(kind), x, y, variant) for kind, x, y, variant in data.scenery],
+        dtype=SCENERY_DTYPE)
+    corners = np.array(
+        [(x, y, direction.value) for x, y, direction in data.corners],
+        dtype=CORNER_DTYPE)
+
+    return b"".join([
+        header,
+        data.grid.buffer(),
+        data.collidable_grid.buffer(),
+        data.tiles.buffer(),
+        scenery.tobytes(),
+        corners.tobytes(),
+    ])
+
+
+def loads(raw: bytes) -> generation.MapData:
+    """Raises ValueError when raw isn't a map from this generator."""
+    if len(raw) < HEADER.size:
+        raise ValueError("map file is too short")
+
+    magic, format_version, generator_version, seed, width, height, biome, num_scenery, num_corners = HEADER.unpack_from(raw)
+    if magic != MAGIC or format_version != FORMAT_VERSION or generator_version != generation.GENERATOR_VERSION:
+        raise ValueError("not a map file of this version")
+
+    cells = width * height
+    expected = HEADER.size + cells * 3 + num_scenery * SCENERY_DTYPE.itemsize + num_corners * CORNER_DTYPE.itemsize
+    if len(raw) != expected:
+        raise ValueError("map file is {} bytes, expected {}".format(len(raw), expected))
+
+    data = generation.MapData(width, height, c.Biome(biome))
+    data.seed = seed
+
+    offset = HEADER.size
+    data.grid = grid.Grid.from_bytes(width, height, raw[offset:offset + cells])
+    offset += cells
+    data.collidable_grid = grid.Grid.from_bytes(width, height, raw[offset:offset + cells])
+    offset += cells
+    data.tiles = grid.Grid.from_bytes(width, height, raw[offset:offset + cells])
+    offset += cells
+
+    scenery = np.frombuffer(raw, dtype=SCENERY_DTYPE, count=num_scenery, offset=offset)
+    offset += scenery.nbytes
+    corners = np.frombuffer(raw, dtype=CORNER_DTYPE, count=num_corners, offset=offset)
+
+    data.scenery = [(SCENERY_KINDS[kind], x, y, variant) for kind, x, y, variant in scenery.tolist()]
+    data.corners = [(x, y, c.Direction(direction)) for x, y, direction in corners.tolist()]
+    return data
+
+
+def load(path: str) -> Optional[generation.MapData]:
+    """The cached map at path, or None if it's missing or unreadable."""
+    try:
+        with open(path, "rb") as f:
+            return loads(f.read())
+    except (OSError, ValueError):
+        return None
+
+
+def save(data: generation.MapData, path: str) -> None:
+    directory = os.path.dirname(path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory, exist_ok=True)
+
+    # Write next to the real file and swap it in, so a map that is
+    # being generated by two processes at once is never half written.
+    temp_path = "{}.{}.tmp".format(path, os.getpid())
+    with open(temp_path, "wb") as f:
+        f.write(dumps(data))
+    os.replace(temp_path, path)
+
+
+def prune(directory: str=CACHE_DIR, limit: int=c.MAP_CACHE_LIMIT) -> None:
+    """Forget the least recently written maps past limit."""
+    try:
+        paths = [os.path.join(directory, name) for name in os.listdir(directory) if name.endswith(".map")]
+    except OSError:
+        return
+
+    if len(paths) <= limit:
+        return
+
+    def written(path: str) -> float:
+        try:
+            return os.path.getmtime(path)
+        except OSError:
+            # Already removed, by another process.
+            return 0
+
+    paths.sort(key=written, reverse=True)
+    for path in paths[limit:]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def generate(width: int, height: int, biome: c.Biome, seed: int, directory: str=CACHE_DIR, cache: bool=True) -> generation.MapData:
+    """Load the map from the cache, or generate and cache it.
+
+    :param cache: Use the cache at all. Only worth it for seeds that come
+                  around again, like c.MAP_SEED, random seeds would only
+                  churn the cache.
+    """
+    if not cache:
+        return generation.generate_seeded(width, height, biome, seed)
+
+    seed &= generation.SEED_MASK
+    path = cache_path(seed, biome, width, height, directory)
+    data = load(path)
+    if data is None:
+        data = generation.generate_seeded(width, height, biome, seed)
+        try:
+            save(data, path)
+            prune(directory)
+        except (OSError, struct.error):
+            # The cache only saves time, a read only directory is fine.
+            pass
+
+    return data
@@ -0,0 +1,105 @@
+"""
+Minimap of a whole map, one pixel per tile.
+
+The pixels come straight from the MapData arrays. Every tile index has a
+color, the average of its tile image, and collidable cells get the
+scenery color instead. The surface is built once through surfarray, and
+after that only the cells that changed are colored again. The player and
+NPC dots are drawn on the screen over it each frame.
+"""
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+import pygame
+
+from . import generation
+from . import tile_surfaces
+
+from .. import constants as c
+
+
+class Minimap:
+    """
+    :param palette: (len(generation.tile_names), 3) colors of the tile
+                    indices. Averaged from the tile images when None.
+    """
+    def __init__(self, data: generation.MapData, palette: Optional[np.ndarray]=None) -> None:
+        self.data = data
+        self.palette = palette
+
+        # Built the first time it's drawn.
+        self.surface = None # type: Optional[pygame.Surface]
+        # Goes up whenever the surface changes.
+        self.version = 0
+
+
+    def colors(self, gridx: slice=slice(None), gridy: slice=slice(None)) -> np.ndarray:
+        """(width, height, 3) colors of the cells in the slices."""
+        if self.palette is None:
+            self.palette = tile_palette()
+
+        colors = self.palette[self.data.tiles.array[gridx, gridy]]
+        colors[self.data.collidable_grid.array[gridx, gridy] > 0] = c.MINIMAP_SCENERY_COLOR
+        return colors
+
+
+    def build(self) -> pygame.Surface:
+        surface = pygame.surfarray.make_surface(self.colors())
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
+        self.surface = surface
+        self.version += 1
+        return surface
+
+
+    def patch(self, rect: pygame.Rect) -> None:
+        """Color the cells under rect again, in real locations."""
+        if self.surface is None:
+            return
+
+        first_gridx = max(rect.left // c.TILE_SIZE, 0)
+        last_gridx = min((rect.right - 1) // c.TILE_SIZE + 1, self.data.width)
+        first_gridy = max(rect.top // c.TILE_SIZE, 0)
+        last_gridy = min((rect.bottom - 1) // c.TILE_SIZE + 1, self.data.height)
+        if first_gridx >= last_gridx or first_gridy >= last_gridy:
+            return
+
+        cells = pygame.rect.Rect(first_gridx, first_gridy, last_gridx - first_gridx, last_gridy - first_gridy)
+        pygame.surfarray.blit_array(self.surface.subsurface(cells), self.colors(slice(first_gridx, last_gridx), slice(first_gridy, last_gridy)))
+        self.version += 1
+
+
+    def window(self, center: Tuple[int, int], size: Tuple[int, int]) -> pygame.Rect:
+        """Cells shown around center, a real location. The whole map
+        when it fits in size."""
+        window = pygame.rect.Rect((0, 0), (min(size[0], self.data.width), min(size[1], self.data.height)))
+        window.center = (center[0] // c.TILE_SIZE, center[1] // c.TILE_SIZE)
+        return window.clamp(pygame.rect.Rect(0, 0, self.data.width, self.data.height))
+
+
+    def draw(self, surface: pygame.Surface, topleft: Tuple[int, int], window: pygame.Rect, dots: Iterable[Tuple[Tuple[int, int], Tuple[int, int, int]]]) -> pygame.Rect:
+        """Draw the cells in window at topleft on surface, with a dot for
+        every (real location, color) inside it. Returns the rect drawn."""
+        if self.surface is None:
+            self.build()
+
+        drawn = surface.blit(self.surface, topleft, window)
+
+        size = c.MINIMAP_DOT_SIZE
+        for (x, y), color in dots:
+            gridx = x // c.TILE_SIZE - window.x
+            gridy = y // c.TILE_SIZE - window.y
+            if 0 <= gridx < window.width and 0 <= gridy < window.height:
+                dot = pygame.rect.Rect(0, 0, size, size)
+                dot.center = (topleft[0] + gridx, topleft[1] + gridy)
+                surface.fill(color, dot.clip(drawn))
+
+        return drawn
+
+
+def tile_palette() -> np.ndarray:
+    """Average color of every tile image, by tile index."""
+    palette = np.zeros((len(generation.tile_names), 3), dtype=np.uint8)
+    for index, name in enumerate(generation.tile_names):
+        palette[index] = pygame.transform.average_color(tile_surfaces.get(name))[:3]
+    return palette
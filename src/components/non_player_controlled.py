@@ -1,12 +1,14 @@
-from typing import List, Optional
+from typing import Optional
 
 import random
 
 import pygame
 
-from . import helpers
+from . import animations
+from . import grid
 
 from .. import constants as c
+from .. import phys
 from .. import setup
 from .. import tools
 
@@ -31,17 +33,9 @@ class Npc(pygame.sprite.Sprite):
     def __init__(self, x, y) -> None:
         super().__init__()
 
-        self.sprite_sheet = setup.GFX["hero"]
-        self.current_frames = self.load_up_sprites_from_sheet()
-
-        self.frames_dict = {
-            c.Direction.UP: self.load_up_sprites_from_sheet(),
-            c.Direction.DOWN: self.load_down_sprites_from_sheet(),
-            c.Direction.LEFT: self.load_left_sprites_from_sheet(),
-            c.Direction.RIGHT: self.load_right_sprites_from_sheet(),
-        }
-
-        self.current_frames = self.load_up_sprites_from_sheet()
+        # Shared by every sprite walking with the hero sheet.
+        self.frames_dict = animations.directions("hero", c.NPC_MULT)
+        self.current_frames = self.frames_dict[c.Direction.UP]
         self.frame_index = 0
 
         self.image = self.current_frames[self.frame_index]
@@ -50,86 +44,50 @@ def __init__(self, x, y) -> None:
         self.rect.x = x
         self.rect.y = y
 
-        self.walking_speed = c.speeds["npc_roaming"]
+        # Pixels per second.
+        self.walking_speed = c.speeds["npc_roaming"] * c.SPEED_RATE
         self.direction = c.Direction.UP
         self.previous_direction = c.Direction.UP
+
+        # Parts of a pixel moved, but not drawn yet.
+        self.x_carry = 0.0
+        self.y_carry = 0.0
+
+        self.dt = 0
         self.set_velocity()
 
         self.walking_dir_change_counter = 0
         self.walking_dir_change_interval = None # type: int
         self.standing_still_direction_index = 4 # Index for c.Direction.NONE in direction
 
-        # Affect standing still frequency.
-        self.standing_still_interval = 20
+        # Affect standing still frequency. In ticks.
+        self.standing_still_interval = c.TICK_RATE // 2
         # For every one added, double the standing still chance.
         self.increase_standing_still_chance = len(directions) + 1
 
-        self.dt = 0
         self.walking_timer = 0
         self.animation_speed_static = 120
 
 
-    def load_up_sprites_from_sheet(self) -> List[pygame.Surface]:
-        images = []
-        # Duplicate first image, use first image as a placeholder
-        # indicating that the animation hasn't ran yet
-        images.append(helpers.get_image(79, 283, 98, 202, self.sprite_sheet, c.NPC_MULT))
-        images.append(helpers.get_image(79, 283, 98, 202, self.sprite_sheet, c.NPC_MULT))
-        images.append(helpers.get_image(335, 283, 98, 198, self.sprite_sheet, c.NPC_MULT))
-        images.append(helpers.get_image(591, 283, 98, 202, self.sprite_sheet, c.NPC_MULT))
-        images.append(helpers.get_image(847, 283, 98, 198, self.sprite_sheet, c.NPC_MULT))
-        return images
-
-
-    def load_down_sprites_from_sheet(self) -> List[pygame.Surface]:
-        images = []
-        # Duplicate first image, use first image as a placeholder
-        # indicating that the animation hasn't ran yet
-        images.append(helpers.get_image(79, 27, 98, 202, self.sprite_sheet, c.NPC_MULT))
-        images.append(helpers.get_image(79, 27, 98, 202, self.sprite_sheet, c.NPC_MULT))
-        images.append(helpers.get_image(335, 27, 98, 198, self.sprite_sheet, c.NPC_MULT))
-        images.append(helpers.get_image(591, 27, 98, 202, self.sprite_sheet, c.NPC_MULT))
-        images.append(helpers.get_image(847, 27, 98, 198, self.sprite_sheet, c.NPC_MULT))
-        return images
-
-
-    def load_left_sprites_from_sheet(self) -> List[pygame.Surface]:
-        images = []
-        # Duplicate first image, use first image as a placeholder
-        # indicating that the animation hasn't ran yet
-        images.append(helpers.get_image(67, 535, 106, 198, self.sprite_sheet, c.NPC_MULT))
-        images.append(helpers.get_image(67, 535, 106, 198, self.sprite_sheet, c.NPC_MULT))
-        images.append(helpers.get_image(323, 535, 106, 194, self.sprite_sheet, c.NPC_MULT))
-        images.append(helpers.get_image(579, 535, 106, 198, self.sprite_sheet, c.NPC_MULT))
-        images.append(helpers.get_image(835, 535, 106, 194, self.sprite_sheet, c.NPC_MULT))
-        return images
-
-
-    def load_right_sprites_from_sheet(self) -> List[pygame.Surface]:
-        images = []
-        # Duplicate first image, use first image as a placeholder
-        # indicating that the animation hasn't ran yet
-        images.append(helpers.get_image(83, 791, 106, 198, self.sprite_sheet, c.NPC_MULT))
-        images.append(helpers.get_image(83, 791, 106, 198, self.sprite_sheet, c.NPC_MULT))
-        images.append(helpers.get_image(339, 791, 106, 194, self.sprite_sheet, c.NPC_MULT))
-        images.append(helpers.get_image(595, 791, 106, 198, self.sprite_sheet, c.NPC_MULT))
-        images.append(helpers.get_image(851, 791, 106, 194, self.sprite_sheet, c.NPC_MULT))
-        return images
-
-
     def set_velocity(self) -> None:
         """Set the speed based on the direction"""
         self.x_vel = 0
         self.y_vel = 0
 
+        # Convert dt to seconds (milliseconds / 1000)
+        walk_sp = self.walking_speed * self.dt / 1000
+
         if self.direction == c.Direction.LEFT:
-            self.x_vel = -self.walking_speed
+            self.x_vel = -walk_sp
         elif self.direction == c.Direction.RIGHT:
-            self.x_vel = self.walking_speed
+            self.x_vel = walk_sp
         elif self.direction == c.Direction.UP:
-            self.y_vel = -self.walking_speed
+            self.y_vel = -walk_sp
         elif self.direction == c.Direction.DOWN:
-            self.y_vel = self.walking_speed
+            self.y_vel = walk_sp
+
+        self.x_vel, self.x_carry = phys.sub_pixel_step(self.x_vel, self.x_carry)
+        self.y_vel, self.y_carry = phys.sub_pixel_step(self.y_vel, self.y_carry)
 
         if not self.direction == c.Direction.NONE:
             self.current_frames = self.frames_dict[self.direction]
@@ -161,8 +119,8 @@ def pick_new_direction(self, ran_into_wall: bool=False) -> c.Direction:
 
 
     def auto_walk(self) -> None:
-        interval_change_sec_min = c.FPS * 1
-        interval_change_sec_max = c.FPS * 2
+        interval_change_sec_min = c.TICK_RATE * 1
+        interval_change_sec_max = c.TICK_RATE * 2
         self.set_velocity()
 
         if self.walking_dir_change_interval is None:
@@ -242,7 +200,7 @@ def get_closest_collisions(self) -> Optional[pygame.rect.Rect]:
                     grid_x = int((self.rect.x - (self.rect.x % ts)) / ts)
                     grid_y = int((self.rect.y - (self.rect.y % ts)) / ts)
 
-                    if self.collidable_grid[grid_x + i][grid_y + j] > 0:
+                    if self.collidable_grid.get(grid_x + i, grid_y + j) > 0:
                         # Expand grid_x and grid_y  back into normal
                         # coords (*64), then add the current i and j.
                         rect = pygame.rect.Rect((grid_x*64 + i*ts, grid_y*64 + j*ts), (c.TILE_SIZE, c.TILE_SIZE))
@@ -259,7 +217,7 @@ def handle_state(self, game_time: int) -> None:
         self.auto_walk()
 
 
-    def update(self, dt: int, game_time: int, collidable_grid: List[List[int]]) -> None:
+    def update(self, dt: int, game_time: int, collidable_grid: grid.Grid) -> None:
         self.dt = dt
         self.collidable_grid = collidable_grid
 
@@ -1,11 +1,12 @@
-from typing import List, Optional
+from typing import Optional
 
 import random
 import queue
 
 import pygame
 
-from . import helpers
+from . import animations
+from . import grid
 
 from .. import binds
 from .. import constants as c
@@ -19,21 +20,9 @@ class Player(pygame.sprite.Sprite):
     def __init__(self, x: int, y: int) -> None:
         super().__init__()
 
-        self.sprite_sheet = setup.GFX["hero"]
-        self.current_frames = self.load_up_sprites_from_sheet()
-
-        self.frames_dict = {
-            c.Direction.UP: self.load_up_sprites_from_sheet(),
-            c.Direction.DOWN: self.load_down_sprites_from_sheet(),
-            c.Direction.LEFT: self.load_left_sprites_from_sheet(),
-            c.Direction.RIGHT: self.load_right_sprites_from_sheet(),
-            c.Direction.LEFTUP: self.load_left_sprites_from_sheet(),
-            c.Direction.RIGHTUP: self.load_right_sprites_from_sheet(),
-            c.Direction.LEFTDOWN: self.load_left_sprites_from_sheet(),
-            c.Direction.RIGHTDOWN: self.load_right_sprites_from_sheet(),
-        }
-
-        self.current_frames = self.load_up_sprites_from_sheet()
+        # Shared by every sprite walking with the hero sheet.
+        self.frames_dict = animations.directions("hero", c.NPC_MULT)
+        self.current_frames = self.frames_dict[c.Direction.UP]
         self.frame_index = 0
 
         self.image = self.current_frames[self.frame_index]
@@ -41,72 +30,29 @@ def __init__(self, x: int, y: int) -> None:
         self.rect.x = x
         self.rect.y = y
 
-        self.vel = c.speeds["player"] * c.FPS
+        # Pixels per second.
+        self.vel = c.speeds["player"] * c.SPEED_RATE
 
         self.direction = c.Direction.NONE
         self.previous_direction = c.Direction.NONE
         self.x_vel = 0
         self.y_vel = 0
 
+        # Parts of a pixel moved, but not drawn yet.
+        self.x_carry = 0.0
+        self.y_carry = 0.0
+
         self.dt = 0
         self.walking_timer = 0
         self.animation_speed_static = 120
 
 
-    def load_up_sprites_from_sheet(self) -> List[pygame.Surface]:
-        images = []
-        # Duplicate first image, use first image as a placeholder
-        # indicating that the animation hasn't ran yet
-        images.append(helpers.get_image(79, 283, 98, 202, self.sprite_sheet, c.NPC_MULT))
-        images.append(helpers.get_image(79, 283, 98, 202, self.sprite_sheet, c.NPC_MULT))
-        images.append(helpers.get_image(335, 283, 98, 198, self.sprite_sheet, c.NPC_MULT))
-        images.append(helpers.get_image(591, 283, 98, 202, self.sprite_sheet, c.NPC_MULT))
-        images.append(helpers.get_image(847, 283, 98, 198, self.sprite_sheet, c.NPC_MULT))
-        return images
-
-
-    def load_down_sprites_from_sheet(self) -> List[pygame.Surface]:
-        images = []
-        # Duplicate first image, use first image as a placeholder
-        # indicating that the animation hasn't ran yet
-        images.append(helpers.get_image(79, 27, 98, 202, self.sprite_sheet, c.NPC_MULT))
-        images.append(helpers.get_image(79, 27, 98, 202, self.sprite_sheet, c.NPC_MULT))
-        images.append(helpers.get_image(335, 27, 98, 198, self.sprite_sheet, c.NPC_MULT))
-        images.append(helpers.get_image(591, 27, 98, 202, self.sprite_sheet, c.NPC_MULT))
-        images.append(helpers.get_image(847, 27, 98, 198, self.sprite_sheet, c.NPC_MULT))
-        return images
-
-
-    def load_left_sprites_from_sheet(self) -> List[pygame.Surface]:
-        images = []
-        # Duplicate first image, use first image as a placeholder
-        # indicating that the animation hasn't ran yet
-        images.append(helpers.get_image(67, 535, 106, 198, self.sprite_sheet, c.NPC_MULT))
-        images.append(helpers.get_image(67, 535, 106, 198, self.sprite_sheet, c.NPC_MULT))
-        images.append(helpers.get_image(323, 535, 106, 194, self.sprite_sheet, c.NPC_MULT))
-        images.append(helpers.get_image(579, 535, 106, 198, self.sprite_sheet, c.NPC_MULT))
-        images.append(helpers.get_image(835, 535, 106, 194, self.sprite_sheet, c.NPC_MULT))
-        return images
-
-
-    def load_right_sprites_from_sheet(self) -> List[pygame.Surface]:
-        images = []
-        # Duplicate first image, use first image as a placeholder
-        # indicating that the animation hasn't ran yet
-        images.append(helpers.get_image(83, 791, 106, 198, self.sprite_sheet, c.NPC_MULT))
-        images.append(helpers.get_image(83, 791, 106, 198, self.sprite_sheet, c.NPC_MULT))
-        images.append(helpers.get_image(339, 791, 106, 194, self.sprite_sheet, c.NPC_MULT))
-        images.append(helpers.get_image(595, 791, 106, 198, self.sprite_sheet, c.NPC_MULT))
-        images.append(helpers.get_image(851, 791, 106, 194, self.sprite_sheet, c.NPC_MULT))
-        return images
-
-
     def set_velocity(self) -> None:
         """Set the speed based on the direction"""
         # Convert dt to seconds (milliseconds / 1000)
         dt_s = self.dt / 1000
-        self.walk_sp = round(self.vel * dt_s)
-        self.diag_sp = round(phys.normalize(self.vel, self.vel) * dt_s)
+        self.walk_sp = self.vel * dt_s
+        self.diag_sp = phys.normalize(self.vel, self.vel) * dt_s
 
         if self.direction == c.Direction.LEFT:
             self.x_vel = -self.walk_sp
@@ -136,6 +82,9 @@ def set_velocity(self) -> None:
             self.x_vel = 0
             self.y_vel = 0
 
+        self.x_vel, self.x_carry = phys.sub_pixel_step(self.x_vel, self.x_carry)
+        self.y_vel, self.y_carry = phys.sub_pixel_step(self.y_vel, self.y_carry)
+
 
     def walk(self, inp: binds.Input) -> None:
         self.previous_direction = self.direction
@@ -214,7 +163,7 @@ def get_closest_collisions(self) -> Optional[pygame.rect.Rect]:
                     grid_x = int((self.rect.x - (self.rect.x % ts)) / ts)
                     grid_y = int((self.rect.y - (self.rect.y % ts)) / ts)
 
-                    if self.collidable_grid[grid_x + i][grid_y + j] > 0:
+                    if self.collidable_grid.get(grid_x + i, grid_y + j) > 0:
                         # Expand grid_x and grid_y  back into normal
                         # coords (*64), then add the current i and j.
                         rect = pygame.rect.Rect((grid_x*64 + i*ts, grid_y*64 + j*ts), (c.TILE_SIZE, c.TILE_SIZE))
@@ -236,7 +185,7 @@ def handle_state(self, inp: binds.Input) -> None:
         #   and slide in that x or y direction until a wall is hit.
 
 
-    def update(self, game_info: gameinfo.GameInfo, collidable_grid: List[List[int]]) -> None:
+    def update(self, game_info: gameinfo.GameInfo, collidable_grid: grid.Grid) -> None:
         self.collidable_grid = collidable_grid
         self.dt = game_info.dt
 
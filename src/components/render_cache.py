@@ -0,0 +1,137 @@
+"""
+Render cache for the ground.
+
+The map is split into square render chunks of c.RENDER_CHUNK_SIZE tiles.
+A chunk is baked into its own surface the first time it gets within
+c.CAMERA_BIGGER_SIZE of the camera, and drawing a frame is then one blit
+per visible chunk. Changes to baked scenery mark only the chunks under
+them dirty, and those are baked again the next time they are drawn.
+
+Baked chunks are kept until they use more than the memory budget, then
+the least recently drawn are dropped.
+
+The render worker draws while the main thread marks chunks dirty, so
+both go through a lock.
+"""
+from typing import Callable, Iterator, Optional, Set, Tuple
+
+from collections import OrderedDict
+import threading
+
+import pygame
+
+from .. import constants as c
+
+
+# Draws the map area (second argument) into a surface (first argument)
+# whose top left is the top left of the area.
+BakeFunction = Callable[[pygame.Surface, pygame.Rect], None]
+
+
+class RenderCache:
+    def __init__(self, bounds: pygame.Rect, bake: BakeFunction, budget: int=c.RENDER_CACHE_BUDGET) -> None:
+        self.bounds = pygame.rect.Rect(bounds)
+        self.bake = bake
+        self.budget = budget
+
+        self.chunk_size = c.RENDER_CHUNK_SIZE * c.TILE_SIZE
+
+        # Baked chunks, least recently drawn first.
+        self.surfaces = OrderedDict() # type: OrderedDict
+        self.dirty = set() # type: Set[Tuple[int, int]]
+        self.used = 0 # Bytes.
+
+        # Held while the chunks are changed. Baking can mark chunks dirty,
+        # from the same thread.
+        self.lock = threading.RLock()
+
+
+    def chunk_rect(self, key: Tuple[int, int]) -> pygame.Rect:
+        rect = pygame.rect.Rect((key[0] * self.chunk_size, key[1] * self.chunk_size), (self.chunk_size, self.chunk_size))
+        return rect.clip(self.bounds)
+
+
+    def keys(self, rect: pygame.Rect) -> Iterator[Tuple[int, int]]:
+        """Every chunk touching rect, inside of the bounds."""
+        rect = rect.clip(self.bounds)
+        if not rect:
+            return
+
+        size = self.chunk_size
+        for cy in range(rect.top // size, (rect.bottom - 1) // size + 1):
+            for cx in range(rect.left // size, (rect.right - 1) // size + 1):
+                yield cx, cy
+
+
+    def mark_dirty(self, rect: pygame.Rect) -> None:
+        """Bake the chunks under rect again, the next time they are drawn."""
+        with self.lock:
+            for key in self.keys(rect):
+                if key in self.surfaces:
+                    self.dirty.add(key)
+
+
+    def clear(self) -> None:
+        with self.lock:
+            self.surfaces.clear()
+            self.dirty.clear()
+            self.used = 0
+
+
+    def draw(self, surface: pygame.Surface, camera: pygame.Rect, offset: Optional[Tuple[int, int]]=None) -> None:
+        """Draw the chunks under the camera.
+
+        :param offset: Subtracted from every chunk location. For surfaces
+                       that only cover the camera, instead of the whole map.
+        """
+        if offset is None:
+            offset = (0, 0)
+
+        # Bake a little past the camera, so chunks are usually ready
+        # before they show up on the screen.
+        expanded = camera.inflate(c.CAMERA_BIGGER_SIZE * 2, c.CAMERA_BIGGER_SIZE * 2)
+        needed = list(self.keys(expanded))
+        with self.lock:
+            for key in needed:
+                self.__build(key)
+
+            blits = []
+            for key in self.keys(camera):
+                rect = self.chunk_rect(key)
+                blits.append((self.surfaces[key], (rect.x - offset[0], rect.y - offset[1])))
+            surface.blits(blits, doreturn=False)
+
+            self.__evict(set(needed))
+
+
+    def __build(self, key: Tuple[int, int]) -> None:
+        chunk_surface = self.surfaces.get(key)
+        if chunk_surface is None:
+            rect = self.chunk_rect(key)
+            chunk_surface = pygame.Surface(rect.size).convert()
+            self.surfaces[key] = chunk_surface
+            self.used += self.__size(chunk_surface)
+            self.dirty.add(key)
+
+        self.surfaces.move_to_end(key)
+
+        if key in self.dirty:
+            # Baking can mark the chunk dirty again, like when it loads
+            # scenery that hangs over it. Then it is baked once more on
+            # the next draw.
+            self.dirty.discard(key)
+            self.bake(chunk_surface, self.chunk_rect(key))
+
+
+    def __evict(self, keep: Set[Tuple[int, int]]) -> None:
+        for key in list(self.surfaces):
+            if self.used <= self.budget:
+                break
+            if key not in keep:
+                self.used -= self.__size(self.surfaces.pop(key))
+                self.dirty.discard(key)
+
+
+    @staticmethod
+    def __size(surface: pygame.Surface) -> int:
+        return surface.get_width() * surface.get_height() * surface.get_bytesize()
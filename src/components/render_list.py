@@ -0,0 +1,181 @@
+"""
+Depth sorted drawing for sprites that stand on the map.
+
+Sprites are kept sorted by layer, then by depth, the bottom of their rect
+on the map. Something standing further down the screen is in front, so
+it's drawn later. The order is kept between frames and only sprites
+that moved are sorted again.
+"""
+from typing import Dict, List, Optional, Tuple
+
+import bisect
+import threading
+
+import pygame
+
+from .. import phys
+
+
+# Layers, drawn in this order.
+GROUND = 0
+ENTITIES = 1
+LAYERS = (GROUND, ENTITIES)
+
+# Keys are layer * LAYER_SPAN + depth, so one sort covers both.
+LAYER_SPAN = 1 << 32
+
+
+class RenderList(pygame.sprite.Group):
+    """A sprite group that keeps its sprites in draw order.
+
+    Add sprites with add_to_layer. Sprites added as moving are sorted
+    again by refresh, call move for any other sprite whose rect changed.
+    Sprites with equal keys draw in the order they were added.
+    """
+    def __init__(self, *sprites: pygame.sprite.Sprite) -> None:
+        # Sorted keys, and the sprite of each key.
+        self.keys = [] # type: List[int]
+        self.order = [] # type: List[pygame.sprite.Sprite]
+
+        self.placed = {} # type: Dict[pygame.sprite.Sprite, int]
+        self.depths = {} # type: Dict[pygame.sprite.Sprite, Tuple[int, int]]
+        self.moving = [] # type: List[pygame.sprite.Sprite]
+
+        # How far the key of a sprite can be from the top and bottom of
+        # its rect. Only grows, it bounds which keys render looks at.
+        self.above = 0
+        self.below = 0
+
+        # Sprites are moved by the update, while chunks loaded by the
+        # render worker add tree tops.
+        self.lock = threading.Lock()
+
+        super().__init__(*sprites)
+
+
+    def add_to_layer(self, layer: int, *sprites: pygame.sprite.Sprite, depth_offset: int=0, moving: bool=False) -> None:
+        """
+        :param depth_offset: Added to the bottom of the rect for the depth.
+                             Tree tops stand where their bottom half does.
+        :param moving: Check the sprites for movement on every refresh.
+        """
+        for sprite in sprites:
+            if self.has_internal(sprite):
+                continue
+
+            self.depths[sprite] = (layer, depth_offset)
+            if moving:
+                self.moving.append(sprite)
+            self.add(sprite)
+
+
+    def key(self, sprite: pygame.sprite.Sprite) -> int:
+        layer, depth_offset = self.depths.get(sprite, (ENTITIES, 0))
+        return layer * LAYER_SPAN + sprite.rect.bottom + depth_offset
+
+
+    def add_internal(self, sprite: pygame.sprite.Sprite, layer: None=None) -> None:
+        super().add_internal(sprite)
+
+        depth_offset = self.depths.get(sprite, (ENTITIES, 0))[1]
+        self.above = max(self.above, sprite.rect.height + depth_offset)
+        self.below = min(self.below, depth_offset)
+
+        with self.lock:
+            self.__place(sprite, self.key(sprite))
+
+
+    def remove_internal(self, sprite: pygame.sprite.Sprite) -> None:
+        super().remove_internal(sprite)
+        with self.lock:
+            self.__unplace(sprite)
+
+        self.depths.pop(sprite, None)
+        if sprite in self.moving:
+            self.moving.remove(sprite)
+
+
+    def move(self, sprite: pygame.sprite.Sprite) -> None:
+        """Sort a sprite again, after its rect changed."""
+        key = self.key(sprite)
+        if key != self.placed[sprite]:
+            with self.lock:
+                self.__unplace(sprite)
+                self.__place(sprite, key)
+
+
+    def refresh(self) -> None:
+        """Sort the moving sprites again. Call once a frame, after they
+        moved."""
+        for sprite in self.moving:
+            self.move(sprite)
+
+
+    def render(self, surface: pygame.Surface, camera: pygame.Rect, offset: Optional[Tuple[int, int]]=None) -> None:
+        """Draw the sprites under the camera, in order.
+
+        :param offset: Subtracted from every sprite location. For surfaces
+                       that only cover the camera, instead of the whole map.
+        """
+        offset_x, offset_y = offset if offset is not None else (0, 0)
+        order = self.order
+
+        with self.lock:
+            for layer in LAYERS:
+                first, last = self.__visible(layer, camera)
+                for index in range(first, last):
+                    sprite = order[index]
+                    rect = sprite.rect
+                    if camera.colliderect(rect):
+                        surface.blit(sprite.image, (rect.x - offset_x, rect.y - offset_y))
+
+
+    def snapshot(self, camera: pygame.Rect, offset: Optional[Tuple[int, int]]=None, previous: Optional[Dict[pygame.sprite.Sprite, Tuple[int, int]]]=None, alpha: float=1) -> Tuple[Tuple[pygame.Surface, Tuple[int, int]], ...]:
+        """What render would draw, as (image, location) pairs for
+        Surface.blits. Stays the same when the sprites change after.
+
+        :param previous: Earlier top left of sprites. They are drawn alpha
+                         of the way from there to where they are now.
+        """
+        offset_x, offset_y = offset if offset is not None else (0, 0)
+        order = self.order
+        visible = [] # type: List[Tuple[pygame.Surface, Tuple[int, int]]]
+
+        with self.lock:
+            for layer in LAYERS:
+                first, last = self.__visible(layer, camera)
+                for index in range(first, last):
+                    sprite = order[index]
+                    rect = sprite.rect
+                    if camera.colliderect(rect):
+                        location = rect.topleft
+                        if previous is not None and sprite in previous:
+                            location = phys.lerp(previous[sprite], location, alpha)
+                        visible.append((sprite.image, (location[0] - offset_x, location[1] - offset_y)))
+
+        return tuple(visible)
+
+
+    def __visible(self, layer: int, camera: pygame.Rect) -> Tuple[int, int]:
+        """Index range of the keys of a layer whose sprites can reach
+        into the camera."""
+        base = layer * LAYER_SPAN
+        first = bisect.bisect_right(self.keys, base + camera.top + self.below)
+        last = bisect.bisect_left(self.keys, base + camera.bottom + self.above)
+        return first, last
+
+
+    def __place(self, sprite: pygame.sprite.Sprite, key: int) -> None:
+        index = bisect.bisect_right(self.keys, key)
+        self.keys.insert(index, key)
+        self.order.insert(index, sprite)
+        self.placed[sprite] = key
+
+
+    def __unplace(self, sprite: pygame.sprite.Sprite) -> None:
+        key = self.placed.pop(sprite)
+        index = bisect.bisect_left(self.keys, key)
+        while self.order[index] is not sprite:
+            index += 1
+        del self.keys[index]
+        del self.order[index]
@@ -0,0 +1,99 @@
+"""
+Render worker.
+
+One long lived thread draws the world, while the main thread updates the
+next frame. Every frame the main thread hands it a Frame, a snapshot of
+what to draw that doesn't change when the sprites do. The worker draws
+it into the back of two screen sized buffers, then swaps them, and the
+main thread copies the front buffer to the screen.
+
+Drawing is one frame behind the update, the price of overlapping them.
+
+The sprites of a Frame are copied out, but the ground is drawn from the
+live map. Its render cache, and the chunks of a world.ChunkedMap, have
+locks of their own for the main thread changing them meanwhile.
+"""
+from typing import Any, NamedTuple, Optional, Tuple
+
+import queue
+import threading
+import traceback
+
+import pygame
+
+from .. import constants as c
+
+
+Frame = NamedTuple("Frame", [
+    # Map whose ground is drawn, not a copy.
+    ("tilemap", Any),
+    # Camera rect, in map locations.
+    ("camera", Tuple[int, int, int, int]),
+    # (image, screen location) pairs, in draw order.
+    ("sprites", Tuple[Tuple[pygame.Surface, Tuple[int, int]], ...]),
+])
+
+
+class RenderWorker(threading.Thread):
+    """
+    Intended to be stored in the GameInfo object.
+
+    Start it, submit a Frame every frame and present the last finished
+    one. Call cleanup to stop it.
+    """
+    daemon = True
+
+    def __init__(self, queue_size: int=c.RENDER_QUEUE_SIZE) -> None:
+        super().__init__()
+
+        # Bounded, so the update can't run ahead of drawing.
+        self.frames = queue.Queue(maxsize=queue_size) # type: queue.Queue
+
+        self.__front = None # type: Optional[pygame.Surface]
+        self.__back = None # type: Optional[pygame.Surface]
+
+        # Held while the front buffer is read or swapped.
+        self.__lock = threading.Lock()
+
+
+    def submit(self, frame: Frame) -> None:
+        """Queue a frame, waiting while the worker is too far behind."""
+        self.frames.put(frame)
+
+
+    def present(self, surface: pygame.Surface) -> None:
+        """Copy the last finished frame to surface."""
+        with self.__lock:
+            if self.__front is not None:
+                surface.blit(self.__front, (0, 0))
+
+
+    def run(self) -> None:
+        while True:
+            frame = self.frames.get()
+            if frame is None:
+                return
+
+            try:
+                self.draw(frame)
+            except Exception:
+                # Keep drawing the next frames, instead of leaving the
+                # update waiting on a full queue.
+                traceback.print_exc()
+
+
+    def draw(self, frame: Frame) -> None:
+        camera = pygame.rect.Rect(frame.camera)
+        if self.__back is None or self.__back.get_size() != camera.size:
+            self.__back = pygame.Surface(camera.size).convert()
+
+        frame.tilemap.update(self.__back, camera, offset=camera.topleft)
+        self.__back.blits(frame.sprites, doreturn=False)
+
+        with self.__lock:
+            self.__front, self.__back = self.__back, self.__front
+
+
+    def cleanup(self) -> None:
+        self.frames.put(None)
+        self.join()
@@ -2,22 +2,21 @@
 
 import pygame
 
+from concurrent import futures
 import random
 
-from . import helpers
+from . import tile_surfaces
 
 from .. import constants as c
 from .. import gameinfo
-from .. import setup
 
 
 class Bush(pygame.sprite.Sprite):
     def __init__(self, x, y, sprite_name) -> None:
         super().__init__()
-        sprite = setup.GFX[sprite_name]
 
         self.name = sprite_name
-        self.image = helpers.get_image(0, 0, c.TILE_SIZE, c.TILE_SIZE, sprite, mult=c.TILE_MULT)
+        self.image = tile_surfaces.get(sprite_name, mult=c.TILE_MULT)
         self.rect = self.image.get_rect()
         self.rect.x = x
         self.rect.y = y
@@ -26,9 +25,7 @@ def __init__(self, x, y, sprite_name) -> None:
 class TreeShadow(pygame.sprite.Sprite):
     def __init__(self, x, y) -> None:
         super().__init__()
-        sprite = setup.GFX["tree_shadow"]
-
-        self.image = helpers.get_image(0, 0, c.TILE_SIZE, c.TILE_SIZE, sprite, mult=c.TILE_MULT)
+        self.image = tile_surfaces.get("tree_shadow", mult=c.TILE_MULT)
 
         self.rect = self.image.get_rect()
         self.rect.x = x
@@ -38,10 +35,9 @@ def __init__(self, x, y) -> None:
 class _Tree(pygame.sprite.Sprite):
     def __init__(self, x: int, y: int, sprite_name: str, other_half_id: int=None) -> None:
         super().__init__()
-        sprite = setup.GFX[sprite_name]
 
         self.name = sprite_name
-        self.image = helpers.get_image(0, 0, c.TILE_SIZE, c.TILE_SIZE, sprite, c.TILE_MULT)
+        self.image = tile_surfaces.get(sprite_name, mult=c.TILE_MULT)
         self.rect = self.image.get_rect()
         self.rect.x = x
         self.rect.y = y
@@ -131,9 +127,7 @@ def update(self, tree_bottom_id: int=None) -> None:
 class FenceLink(pygame.sprite.Sprite):
     def __init__(self, x, y) -> None:
         super().__init__()
-        sprite = setup.GFX["fence_link"]
-
-        self.image = helpers.get_image(0, 0, c.TILE_SIZE, c.TILE_SIZE, sprite, mult=c.TILE_MULT)
+        self.image = tile_surfaces.get("fence_link", mult=c.TILE_MULT)
         self.rect = self.image.get_rect()
         self.rect.x = x
         self.rect.y = y
@@ -142,20 +136,17 @@ def __init__(self, x, y) -> None:
 class FenceEnd(pygame.sprite.Sprite):
     def __init__(self, x, y) -> None:
         super().__init__()
-        sprite = setup.GFX["fence_end"]
-
-        self.image = helpers.get_image(0, 0, c.TILE_SIZE, c.TILE_SIZE, sprite, mult=c.TILE_MULT)
+        self.image = tile_surfaces.get("fence_end", mult=c.TILE_MULT)
         self.rect = self.image.get_rect()
         self.rect.x = x
         self.rect.y = y
 
 
 class WaterCornerCut(pygame.sprite.Sprite):
-    def __init__(self, x, y) -> None:
+    def __init__(self, x, y, flip_x: bool=False, flip_y: bool=False) -> None:
         super().__init__()
-        sprite = setup.GFX["water_top_left_corner_grass"]
 
-        self.image = helpers.get_image(0, 0, c.CORNER_SIZE, c.CORNER_SIZE, sprite, mult=c.TILE_MULT)
+        self.image = tile_surfaces.get("water_top_left_corner_grass", c.CORNER_SIZE, c.CORNER_SIZE, c.TILE_MULT, flip_x, flip_y)
         self.rect = self.image.get_rect()
         self.rect.x = x
         self.rect.y = y
@@ -164,13 +155,6 @@ def __init__(self, x, y) -> None:
 class Stairs(pygame.sprite.Sprite):
     def __init__(self, x, y, name) -> None:
         super().__init__()
-        sprite = setup.GFX[name]
-
-        self.image = helpers.get_image(0, 0, c.TILE_SIZE, c.TILE_SIZE, sprite, mult=c.TILE_MULT)
-        self.rect = self.image.get_rect()
-        self.rect.x = x
-        self.rect.y = y
-
         # Flip some stairs around. So that it's realistic for the player
         # to "walk" down the correct side of the stairs. Should only be
         # left or right (because art).
@@ -178,10 +162,18 @@ def __init__(self, x, y, name) -> None:
             self.stairs_dir = c.Direction.LEFT
         else:
             self.stairs_dir = c.Direction.RIGHT
-            self.image = pygame.transform.flip(self.image, True, False)
+
+        flip = self.stairs_dir == c.Direction.RIGHT
+        self.image = tile_surfaces.get(name, mult=c.TILE_MULT, flip_x=flip)
+        self.rect = self.image.get_rect()
+        self.rect.x = x
+        self.rect.y = y
 
         self.hit = False
 
+        # Future of the MapData for the level these stairs lead to.
+        self.level = None # type: Optional[futures.Future]
+
 
     def update(self, player_rect: pygame.Rect) -> None:
         # Setting hit to true when hit should work even if it's just
@@ -0,0 +1,103 @@
+"""
+Spatial hash for sprite groups.
+
+Sprites are bucketed by the square cells of the map their rect touches,
+so finding the sprites in a rect only looks at the buckets under it,
+instead of testing every sprite in the group.
+"""
+from typing import Dict, Iterator, List, Tuple
+
+import pygame
+
+from .. import constants as c
+
+
+Cell = Tuple[int, int]
+
+
+class SpatialGroup(pygame.sprite.Group):
+    """A sprite group that also keeps its sprites in a spatial hash.
+
+    Adding, removing and killing sprites keep the hash up to date. Call
+    move after changing the rect of a sprite in the group.
+    """
+    def __init__(self, *sprites: pygame.sprite.Sprite, cell_size: int=c.SPATIAL_CELL_SIZE * c.TILE_SIZE) -> None:
+        self.cell_size = cell_size
+
+        self.buckets = {} # type: Dict[Cell, Dict[pygame.sprite.Sprite, None]]
+
+        # Sprite: (cells it is in, order it was added in)
+        self.cells = {} # type: Dict[pygame.sprite.Sprite, Tuple[List[Cell], int]]
+        self.__added = 0
+
+        super().__init__(*sprites)
+
+
+    def cells_under(self, rect: pygame.Rect) -> Iterator[Cell]:
+        size = self.cell_size
+        for cy in range(rect.top // size, (rect.bottom - 1) // size + 1):
+            for cx in range(rect.left // size, (rect.right - 1) // size + 1):
+                yield cx, cy
+
+
+    def add_internal(self, sprite: pygame.sprite.Sprite, layer: None=None) -> None:
+        super().add_internal(sprite)
+        self.__hash(sprite, self.__added)
+        self.__added += 1
+
+
+    def remove_internal(self, sprite: pygame.sprite.Sprite) -> None:
+        super().remove_internal(sprite)
+        self.__unhash(sprite)
+
+
+    def move(self, sprite: pygame.sprite.Sprite) -> None:
+        """Bucket a sprite again, after its rect changed."""
+        order = self.__unhash(sprite)
+        self.__hash(sprite, order)
+
+
+    def query(self, rect: pygame.Rect) -> List[pygame.sprite.Sprite]:
+        """Every sprite colliding with rect, in the order they were added,
+        which is also the order the group iterates in."""
+        found = {} # type: Dict[pygame.sprite.Sprite, int]
+        for cell in self.cells_under(rect):
+            bucket = self.buckets.get(cell)
+            if bucket:
+                # Copied, the draw thread queries while sprites are killed.
+                for sprite in list(bucket):
+                    if sprite not in found and rect.colliderect(sprite.rect):
+                        hashed = self.cells.get(sprite)
+                        if hashed is not None:
+                            found[sprite] = hashed[1]
+
+        return sorted(found, key=found.__getitem__)
+
+
+    def __hash(self, sprite: pygame.sprite.Sprite, order: int) -> None:
+        rect = sprite.rect
+        size = self.cell_size
+        left, top = rect.left // size, rect.top // size
+        if left == (rect.right - 1) // size and top == (rect.bottom - 1) // size:
+            # Most scenery is one tile, which fits in one cell.
+            cells = [(left, top)]
+        else:
+            cells = list(self.cells_under(rect))
+
+        buckets = self.buckets
+        for cell in cells:
+            bucket = buckets.get(cell)
+            if bucket is None:
+                bucket = buckets[cell] = {}
+            bucket[sprite] = None
+        self.cells[sprite] = (cells, order)
+
+
+    def __unhash(self, sprite: pygame.sprite.Sprite) -> int:
+        cells, order = self.cells.pop(sprite)
+        for cell in cells:
+            bucket = self.buckets[cell]
+            del bucket[sprite]
+            if not bucket:
+                del self.buckets[cell]
+        return order
@@ -0,0 +1,52 @@
+"""
+Rendered text, cached.
+
+Most text on the screen is the same from one frame to the next, so
+rendered text is kept in a least recently used cache, by font, text,
+color and antialias.
+
+Numbers like the coordinates and the FPS change all the time and would
+only churn that cache, the HUD keeps only the last one it drew of each.
+Putting them together from a glyph atlas of digits was tried, and took
+about 3 times as long as rendering them at the sizes used.
+
+Cached surfaces are shared and must not be drawn on.
+"""
+from typing import Tuple
+
+from collections import OrderedDict
+
+import pygame
+
+from .. import constants as c
+
+
+# (font, text, color, antialias)
+Key = Tuple[pygame.font.Font, str, Tuple[int, ...], bool]
+
+_rendered = OrderedDict() # type: OrderedDict
+
+# Cache hits and misses of render.
+hits = 0
+misses = 0
+
+
+def render(font: pygame.font.Font, string: str, color: Tuple[int, ...], antialias: bool=True) -> pygame.Surface:
+    """Same as font.render, from the cache when it was rendered before."""
+    global hits, misses
+    key = (font, string, tuple(color), antialias) # type: Key
+    text = _rendered.get(key)
+    if text is not None:
+        hits += 1
+        _rendered.move_to_end(key)
+        return text
+
+    misses += 1
+    _rendered[key] = text = font.render(string, antialias, color)
+    if len(_rendered) > c.TEXT_CACHE_SIZE:
+        _rendered.popitem(last=False)
+    return text
+
+
+def clear() -> None:
+    _rendered.clear()
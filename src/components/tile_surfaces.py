@@ -0,0 +1,58 @@
+"""
+Shared tile surfaces.
+
+Every tile and piece of scenery with the same image draws the same
+surface. Each distinct image, flipped variants included, is cut out of
+setup.GFX and scaled once, the first time it's asked for, and every
+sprite after that gets a reference to it.
+
+Shared surfaces must not be drawn on. Copy one first to change it.
+"""
+from typing import Dict, Tuple
+
+import pygame
+
+from . import helpers
+
+from .. import constants as c
+from .. import setup
+
+
+# (name, width, height, mult, flip x, flip y)
+Key = Tuple[str, int, int, float, bool, bool]
+
+_surfaces = {} # type: Dict[Key, pygame.Surface]
+
+
+def get(name: str, width: int=c.TILE_SIZE, height: int=c.TILE_SIZE, mult: float=1, flip_x: bool=False, flip_y: bool=False) -> pygame.Surface:
+    key = (name, width, height, mult, flip_x, flip_y)
+    image = _surfaces.get(key)
+    if image is None:
+        # Kept here once converted, the cut itself isn't worth keeping too.
+        image = helpers.get_image(0, 0, width, height, setup.GFX[name], mult=mult, cache=False)
+        if flip_x or flip_y:
+            image = pygame.transform.flip(image, flip_x, flip_y)
+        _surfaces[key] = image = _to_display_format(image)
+
+    return image
+
+
+def _to_display_format(image: pygame.Surface) -> pygame.Surface:
+    """Match the pixels of the screen, so blits don't convert them.
+    Ground tiles have no see through pixels, and blit fastest with no
+    alpha at all."""
+    if pygame.display.get_surface() is None:
+        return image
+
+    if pygame.mask.from_surface(image, 254).count() == image.get_width() * image.get_height():
+        return image.convert()
+    return image.convert_alpha()
+
+
+def clear() -> None:
+    _surfaces.clear()
+
+
+def report() -> Tuple[int, int]:
+    """Number of shared surfaces, and the bytes their pixels use."""
+    return helpers.surfaces_report(_surfaces.values())
@@ -7,9 +7,11 @@
 
 import pygame
 
+from . import dirty_rects
 from . import helpers
 from . import inventory
 from . import item
+from . import text
 
 from .. import binds
 from .. import constants as c
@@ -72,12 +74,12 @@ def handle_state(self, selection: str) -> None:
 
     def render_name(self, surface) -> None:
         if self.selected:
-            text = self.font.render(menu_labels[self.name], True, c.SELECTED_GRAY)
+            label = text.render(self.font, menu_labels[self.name], c.SELECTED_GRAY)
         else:
-            text = self.font.render(menu_labels[self.name], True, c.RESTING_GRAY)
+            label = text.render(self.font, menu_labels[self.name], c.RESTING_GRAY)
 
-        text_rect = text.get_rect(center=(setup.screen_size.get_width()/2, self.rect.y + self.rect.height/2))
-        surface.blit(text, text_rect)
+        label_rect = label.get_rect(center=(setup.screen_size.get_width()/2, self.rect.y + self.rect.height/2))
+        surface.blit(label, label_rect)
 
 
     def render_text(self) -> None:
@@ -112,6 +114,9 @@ def __init__(self, x: int, y: int, name: str, color: Tuple[int, ...]) -> None:
         self.keybind = button_binds[self.name]
         # key: wood_axe_icon value: current keybind for action in binds file
 
+        # Image on the screen, to tell when it changes.
+        self.drawn_image = None # type: pygame.Surface
+
         self.game_time = 0
         self.pressed_time = 0
         # Very fast animation when pressed.
@@ -162,6 +167,11 @@ def __init__(self) -> None:
         self.clock = ""
         self.coords = ""
 
+        # Name: ((text, color), rect, surface) of the text last drawn.
+        self.drawn = {} # type: Dict[str, Tuple[Tuple[str, Tuple[int, int, int]], pygame.Rect, pygame.Surface]]
+        # What the minimap last showed, to tell when it changes.
+        self.drawn_minimap = None # type: Any
+
 
     def update_sizes(self) -> None:
         if setup.screen_size.changed():
@@ -169,7 +179,7 @@ def update_sizes(self) -> None:
             self.y = c.IMMUTABLE_HUD_Y
 
 
-    def update(self, screen: pygame.Surface, c_fps: int, player: pygame.sprite.Sprite, map_height: int) -> None:
+    def update(self, screen: pygame.Surface, c_fps: int, player: pygame.sprite.Sprite, map_height: int, minimap: Any, npcs: List[pygame.sprite.Sprite]) -> None:
         if setup.screen_size.changed():
             self.update_sizes()
 
@@ -180,6 +190,8 @@ def update(self, screen: pygame.Surface, c_fps: int, player: pygame.sprite.Sprit
         self.render_clock(screen)
         self.render_coords(screen)
         self.render_fps(screen)
+        if minimap is not None:
+            self.render_minimap(screen, minimap, player, npcs)
 
 
     def update_clock(self) -> None:
@@ -200,21 +212,60 @@ def update_coords(self, x: int, y: int, map_height: int) -> None:
 
 
     def render_clock(self, surface: pygame.Surface) -> None:
-        text = self.font.render(self.clock, True, c.WHITE)
-        text_rect = text.get_rect(center=(self.x, self.y))
-        surface.blit(text, text_rect)
+        self.render_text(surface, "clock", self.clock, c.WHITE, (self.x, self.y))
 
 
     def render_coords(self, surface: pygame.Surface) -> None:
-        text = self.font.render(self.coords, True, c.SELECTED_GRAY)
-        text_rect = text.get_rect(center=(self.x + c.IMMUTABLE_HUD_X_OFFSET*2, self.y))
-        surface.blit(text, text_rect)
+        self.render_text(surface, "coords", self.coords, c.SELECTED_GRAY, (self.x + c.IMMUTABLE_HUD_X_OFFSET*2, self.y), number=True)
 
 
     def render_fps(self, surface: pygame.surface.Surface) -> None:
-        text = self.font.render(str(round(self.c_fps)), True, c.SELECTED_GRAY)
-        text_rect = text.get_rect(center=(self.x + c.IMMUTABLE_HUD_X_OFFSET*4, self.y))
-        surface.blit(text, text_rect)
+        self.render_text(surface, "fps", str(round(self.c_fps)), c.SELECTED_GRAY, (self.x + c.IMMUTABLE_HUD_X_OFFSET*4, self.y), number=True)
+
+
+    def render_minimap(self, surface: pygame.Surface, minimap: Any, player: pygame.sprite.Sprite, npcs: List[pygame.sprite.Sprite]) -> None:
+        """Draw the minimap in the top right corner, marking it dirty when
+        it changed."""
+        window = minimap.window(player.rect.center, c.MINIMAP_SIZE)
+        dots = [(npc.rect.center, c.MINIMAP_NPC_COLOR) for npc in npcs]
+        dots.append((player.rect.center, c.MINIMAP_PLAYER_COLOR))
+
+        topleft = (setup.screen_size.get_width() - window.width - c.MINIMAP_MARGIN, c.MINIMAP_MARGIN)
+        drawn = minimap.draw(surface, topleft, window, dots)
+
+        # Dots only move on the minimap when they cross a tile.
+        shown = (minimap, minimap.version, drawn, tuple(window), [(location[0] // c.TILE_SIZE, location[1] // c.TILE_SIZE) for location, _ in dots])
+        if shown != self.drawn_minimap:
+            dirty_rects.mark(drawn)
+        self.drawn_minimap = shown
+
+
+    def render_text(self, surface: pygame.Surface, name: str, string: str, color: Tuple[int, int, int], center: Tuple[int, int], number: bool=False) -> None:
+        """Draw text over the last text with that name, marking it dirty
+        when it changed.
+
+        :param number: The text changes often, like the coordinates. It's
+                       only reused from the last frame, and kept out of
+                       the text cache so it doesn't push out other text.
+        """
+        last = self.drawn.get(name)
+        if last is not None and last[0] == (string, color):
+            rendered = last[2]
+        elif number:
+            rendered = self.font.render(string, True, color)
+        else:
+            rendered = text.render(self.font, string, color)
+        text_rect = rendered.get_rect(center=center)
+
+        if last is not None:
+            dirty_rects.repaint(surface, last[1])
+        surface.blit(rendered, text_rect)
+
+        if last is None:
+            dirty_rects.mark(text_rect)
+        elif last[0] != (string, color) or last[1] != text_rect:
+            dirty_rects.mark(text_rect.union(last[1]))
+        self.drawn[name] = ((string, color), text_rect, rendered)
 
     def notification(self) -> None: pass
     def detect_item_change(self) -> None:
@@ -299,4 +350,9 @@ def handle_state(self, mainstate) -> None:
 
 
     def blit_images(self, screen: pygame.Surface) -> None:
-        self.button_group.draw(screen)
+        for button in self.button_group:
+            dirty_rects.repaint(screen, button.rect)
+            screen.blit(button.image, button.rect)
+            if button.image is not button.drawn_image:
+                button.drawn_image = button.image
+                dirty_rects.mark(button.rect)
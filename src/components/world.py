@@ -0,0 +1,268 @@
+"""
+Chunked world.
+
+The world is split into square chunks of c.CHUNK_SIZE tiles. A chunk is
+generated the first time the camera, or a sprite checking collisions,
+gets close to it. Once more than c.MAX_LOADED_CHUNKS are loaded, the
+least recently used chunks are forgotten. Every chunk has its own seed,
+mixed from the world seed and the chunk location, so a forgotten chunk
+comes back exactly the same when it is generated again.
+
+A chunk is carved out of the 3x3 chunk window around it, so the cellular
+automaton and the water edges line up with the neighboring chunks.
+"""
+from typing import Dict, List, Optional, Set, Tuple
+
+from collections import OrderedDict
+import random
+import threading
+
+import numpy as np
+import pygame
+
+from . import autotile, generation, render_cache, scenery, tilemap
+
+from .. import constants as c
+
+
+# Keeps the placement rng from following the grid rng of the same chunk.
+PLACEMENT_SALT = 0x5BD1E995
+
+
+def chunk_seed(world_seed: int, cx: int, cy: int) -> int:
+    """Mix the chunk location into the world seed."""
+    return (world_seed * 0x9E3779B1 ^ cx * 0x85EBCA77 ^ cy * 0xC2B2AE3D) & 0xFFFFFFFF
+
+
+def generate_chunk(world_seed: int, cx: int, cy: int, chunks_wide: int, chunks_high: int, biome: c.Biome) -> generation.MapData:
+    """Generate one chunk, without creating any sprites."""
+    size = c.CHUNK_SIZE
+
+    # Window of chunks around this one, clipped to the world. The edge of
+    # the world works like the edge of a map, out of bounds is solid.
+    first_cx, last_cx = max(cx - 1, 0), min(cx + 1, chunks_wide - 1)
+    first_cy, last_cy = max(cy - 1, 0), min(cy + 1, chunks_high - 1)
+
+    window = np.empty(((last_cx - first_cx + 1) * size, (last_cy - first_cy + 1) * size), dtype=np.uint8)
+    for wcx in range(first_cx, last_cx + 1):
+        for wcy in range(first_cy, last_cy + 1):
+            x = (wcx - first_cx) * size
+            y = (wcy - first_cy) * size
+            rng = np.random.RandomState(chunk_seed(world_seed, wcx, wcy))
+            window[x:x + size, y:y + size] = generation.random_grid(size, size, rng)
+
+    window = generation.simulate(window, generation.NUM_SIM_STEPS, generation.DEATH_LIMIT, generation.BIRTH_LIMIT)
+
+    masks = None
+    if biome == c.Biome.FARMLAND:
+        masks = autotile.settle(window, outside=generation.OUT_OF_BOUNDS)
+
+    # Crop this chunk out of the window.
+    x = (cx - first_cx) * size
+    y = (cy - first_cy) * size
+
+    data = generation.MapData(size, size, biome)
+    data.grid.array[:, :] = window[x:x + size, y:y + size]
+    if masks is not None:
+        masks = masks[x:x + size, y:y + size]
+
+    rng = random.Random(chunk_seed(world_seed, cx, cy) ^ PLACEMENT_SALT)
+    generation.place(data, masks, rng)
+    return data
+
+
+class Chunk:
+    def __init__(self, cx: int, cy: int, data: generation.MapData) -> None:
+        self.cx = cx
+        self.cy = cy
+        self.data = data
+
+        size = c.CHUNK_SIZE * c.TILE_SIZE
+        self.rect = pygame.rect.Rect((cx * size, cy * size), (size, size))
+
+        # Scenery sprites that belong to this chunk.
+        self.sprites = [] # type: List[pygame.sprite.Sprite]
+
+
+class ChunkedGrid:
+    """Grid interface over every chunk of a world, for one of the
+    MapData grids. Reading a point loads its chunk."""
+    def __init__(self, world: "ChunkedMap", name: str) -> None:
+        self.__world = world
+        self.__name = name
+        self.width = world.width
+        self.height = world.height
+
+
+    def in_bounds(self, x: int, y: int) -> bool:
+        return 0 <= x < self.width and 0 <= y < self.height
+
+
+    def get(self, x: int, y: int) -> int:
+        if 0 <= x < self.width and 0 <= y < self.height:
+            size = c.CHUNK_SIZE
+            chunk = self.__world.chunk(x // size, y // size)
+            return getattr(chunk.data, self.__name).get_unchecked(x % size, y % size)
+        raise IndexError("grid point ({}, {}) out of range".format(x, y))
+
+
+    def set(self, x: int, y: int, value: int) -> None:
+        """Set a point, the change outlives the chunk being forgotten."""
+        if 0 <= x < self.width and 0 <= y < self.height:
+            self.__world.edit(self.__name, x, y, value)
+        else:
+            raise IndexError("grid point ({}, {}) out of range".format(x, y))
+
+
+    get_unchecked = get
+    set_unchecked = set
+
+
+class ChunkedMap(tilemap.Map):
+    """Map that only keeps the chunks around the camera.
+
+    Has the same groups and methods that the rest of the game uses from
+    a Map. The render cache only bakes around the camera, so the size of
+    the world doesn't matter for drawing.
+    """
+    def __init__(self, grid_width: int, grid_height: int, biome: c.Biome, seed: Optional[int]=None) -> None:
+        self.biome = biome
+
+        self.create_groups()
+
+        self.width = grid_width
+        self.height = grid_height
+        self.chunks_wide = grid_width // c.CHUNK_SIZE
+        self.chunks_high = grid_height // c.CHUNK_SIZE
+
+        if seed is None:
+            seed = random.getrandbits(32)
+        self.seed = seed
+        self.rng = random.Random(seed ^ tilemap.LOCATION_SALT)
+
+        self.rect = pygame.rect.Rect((0, 0), (self.width * c.TILE_SIZE, self.height * c.TILE_SIZE))
+        self.render_cache = render_cache.RenderCache(self.rect, self.bake_area)
+
+        # Most of the world is never generated, there's nothing to map.
+        self.minimap = None
+
+        # Loaded chunks, least recently used first.
+        self.chunks = OrderedDict() # type: OrderedDict
+
+        # Changes that must survive a chunk being forgotten.
+        self.edits = {} # type: Dict[Tuple[int, int], Dict[Tuple[str, int, int], int]]
+        self.cut_trees = {} # type: Dict[Tuple[int, int], Set[Tuple[int, int]]]
+
+        # Chunks are loaded by both the draw thread and collision checks.
+        self.lock = threading.RLock()
+
+        self.grid = ChunkedGrid(self, "grid")
+        self.collidable_grid = ChunkedGrid(self, "collidable_grid")
+
+
+    def chunk(self, cx: int, cy: int) -> Chunk:
+        """Get a chunk, generating it if it isn't loaded."""
+        key = (cx, cy)
+        with self.lock:
+            chunk = self.chunks.get(key)
+            if chunk is None:
+                chunk = self.__load(cx, cy)
+                self.chunks[key] = chunk
+                self.__evict()
+
+                # Scenery that hangs over the edge of the chunk, like tree
+                # shadows, belongs in the baked neighbors as well.
+                for sprite in chunk.sprites:
+                    if not chunk.rect.contains(sprite.rect):
+                        self.invalidate(sprite.rect)
+            else:
+                self.chunks.move_to_end(key)
+
+            return chunk
+
+
+    def __load(self, cx: int, cy: int) -> Chunk:
+        data = generate_chunk(self.seed, cx, cy, self.chunks_wide, self.chunks_high, self.biome)
+
+        gridx_offset = cx * c.CHUNK_SIZE
+        gridy_offset = cy * c.CHUNK_SIZE
+
+        for (name, x, y), value in self.edits.get((cx, cy), {}).items():
+            getattr(data, name).set_unchecked(x, y, value)
+
+        cut_trees = self.cut_trees.get((cx, cy))
+        if cut_trees:
+            data.scenery = [s for s in data.scenery if not (s[0] == generation.TREE and (s[1], s[2]) in cut_trees)]
+
+        chunk = Chunk(cx, cy, data)
+        chunk.sprites = self.create_scenery(data, gridx_offset, gridy_offset)
+        return chunk
+
+
+    def __unload(self, chunk: Chunk) -> None:
+        for sprite in chunk.sprites:
+            if isinstance(sprite, scenery.TreeBottom) and sprite.dead:
+                point = (sprite.rect.x // c.TILE_SIZE - chunk.cx * c.CHUNK_SIZE, sprite.rect.y // c.TILE_SIZE - chunk.cy * c.CHUNK_SIZE)
+                self.cut_trees.setdefault((chunk.cx, chunk.cy), set()).add(point)
+            sprite.kill()
+
+
+    def __evict(self) -> None:
+        while len(self.chunks) > c.MAX_LOADED_CHUNKS:
+            __, chunk = self.chunks.popitem(last=False)
+            self.__unload(chunk)
+
+
+    def edit(self, name: str, x: int, y: int, value: int) -> None:
+        size = c.CHUNK_SIZE
+        key = (x // size, y // size)
+        point = (name, x % size, y % size)
+
+        with self.lock:
+            self.edits.setdefault(key, {})[point] = value
+            chunk = self.chunks.get(key)
+            if chunk is not None:
+                getattr(chunk.data, name).set_unchecked(point[1], point[2], value)
+
+
+    def tile_name(self, gridx: int, gridy: int) -> str:
+        size = c.CHUNK_SIZE
+        return self.chunk(gridx // size, gridy // size).data.tile_name(gridx % size, gridy % size)
+
+
+    def chunks_around(self, rect: pygame.Rect, distance: int=0) -> List[Chunk]:
+        """Load and return the chunks touching rect, plus distance more
+        chunks in every direction."""
+        size = c.CHUNK_SIZE * c.TILE_SIZE
+        first_cx = max(rect.left // size - distance, 0)
+        last_cx = min((rect.right - 1) // size + distance, self.chunks_wide - 1)
+        first_cy = max(rect.top // size - distance, 0)
+        last_cy = min((rect.bottom - 1) // size + distance, self.chunks_high - 1)
+
+        return [self.chunk(cx, cy) for cy in range(first_cy, last_cy + 1) for cx in range(first_cx, last_cx + 1)]
+
+
+    def find_random_open_location(self) -> Tuple[int, int]:
+        """Random, open location near the middle of the world.
+        Return an actual location on the map, not the grid location."""
+        middle_cx = self.chunks_wide // 2
+        middle_cy = self.chunks_high // 2
+        first_x = max(middle_cx - c.SPAWN_CHUNKS, 0) * c.CHUNK_SIZE
+        last_x = min((middle_cx + c.SPAWN_CHUNKS + 1) * c.CHUNK_SIZE, self.width) - 1
+        first_y = max(middle_cy - c.SPAWN_CHUNKS, 0) * c.CHUNK_SIZE
+        last_y = min((middle_cy + c.SPAWN_CHUNKS + 1) * c.CHUNK_SIZE, self.height) - 1
+
+        while True:
+            x = self.rng.randint(first_x, last_x)
+            y = self.rng.randint(first_y, last_y)
+
+            if self.collidable_grid.get(x, y) == 0:
+                return x * c.TILE_SIZE, y * c.TILE_SIZE
+
+
+    def update(self, surface: pygame.Surface, camera: pygame.Rect, offset: Optional[Tuple[int, int]]=None) -> None:
+        """Draw the baked ground around the camera, loading the chunks
+        close to it first."""
+        with self.lock:
+            self.chunks_around(camera, c.CHUNK_LOAD_DISTANCE)
+            self.render_cache.draw(surface, camera, offset)
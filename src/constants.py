@@ -5,8 +5,15 @@
 
 CAPTION = "Garden"
 
-# Frames per second.
+# Frames drawn per second, 0 draws as fast as possible.
 FPS = 40
+
+# The game itself runs in fixed steps of TICK_MS, however fast frames are
+# drawn. When frames are too slow for this many steps each, the game
+# slows down instead of trying to catch up.
+TICK_RATE = 60
+TICK_MS = 1000 / TICK_RATE
+MAX_TICKS_PER_FRAME = 5
 PG_GET_PRESSED_LENGTH = 323
 CAMERA_BIGGER_SIZE = 100 # Represents increasing each side by this amount.
 
@@ -17,6 +24,7 @@
 DEBUG_ENEMY = False
 DEBUG_PLAYER = False
 DEBUG_NPC = False
+DEBUG_ASSETS = False    # Print how long assets took to load.
 
 
 def flip_player_camera_combo(flip: bool) -> None:
@@ -110,6 +118,11 @@ class Action(enum.Enum):
 LIME_GREEN =    (87, 155, 20)
 DARK_YELLOW =   (188, 188, 0)
 
+# Minimap colors
+MINIMAP_SCENERY_COLOR = (40, 70, 30)
+MINIMAP_PLAYER_COLOR =  WHITE
+MINIMAP_NPC_COLOR =     DARK_YELLOW
+
 
 # Multipliers.
 DEFAULT_BACKGROUND_X_MULT = 0.26042 # Resolution w / background w
@@ -132,6 +145,64 @@ class Action(enum.Enum):
 }
 
 
+# Chunked world.
+# Split farmland into chunks that are generated as the camera gets close
+# and forgotten when far away, instead of one map of map_mult size.
+CHUNKED_WORLD = False
+CHUNK_SIZE = 16             # Tiles per chunk side.
+WORLD_CHUNKS = 1024         # Chunks per world side.
+MAX_LOADED_CHUNKS = 48
+CHUNK_LOAD_DISTANCE = 1     # Chunks loaded past the edge of the camera.
+SPAWN_CHUNKS = 2            # Spawn within this many chunks of the middle.
+
+# Render cache.
+# The ground is baked into surfaces of this many tiles per side, built
+# when they get close to the camera. The least recently drawn are
+# dropped once they use more than the budget.
+RENDER_CHUNK_SIZE = 16
+RENDER_CACHE_BUDGET = 64 * 1024 * 1024   # Bytes.
+
+# Frames the update can be ahead of the render worker.
+RENDER_QUEUE_SIZE = 1
+
+# Only send the parts of the screen that changed to the display, instead
+# of all of it every frame. The whole screen is still sent while the
+# camera scrolls.
+DIRTY_RECTS = False
+
+# Minimap, one pixel per tile. Maps bigger than this show the part
+# around the player.
+MINIMAP_SIZE = (120, 120)
+MINIMAP_MARGIN = 10
+MINIMAP_DOT_SIZE = 3
+
+# Scenery is bucketed by squares of this many tiles, to find what's
+# on the screen without testing every sprite.
+SPATIAL_CELL_SIZE = 8
+
+# Map generation.
+MAP_SEED = None             # Set to an int to get the same farmland every game.
+MAP_CACHE = True            # Keep maps generated from a set seed, like MAP_SEED, on disk.
+MAP_CACHE_LIMIT = 32        # Maps kept in the cache.
+
+# Assets are loaded when first used. These graphics, and the ones in these
+# folders of data/graphics, are loaded in the background once the first
+# frame is up.
+WARM_UP_ASSETS = True
+WARM_UP_GFX = ("hero",)
+WARM_UP_GFX_FOLDERS = ("tiles",)
+# Threads decoding assets, for the warm up and for building the pack.
+ASSET_WORKERS = 4
+# Load graphics from a pack of already decoded pixels, kept in the cache
+# folder and rebuilt when any of the graphics change.
+ASSET_PACK = True
+
+# Caves for the stairs down are generated in this many worker processes.
+LEVEL_WORKERS = 2
+# Seconds to wait for a worker's level before generating it in the game.
+LEVEL_TIMEOUT = 2
+
+
 # Sizes.
 TILE_SIZE = 64
 ORIGINAL_ICON_SIZE = 400
@@ -151,11 +222,19 @@ class Action(enum.Enum):
     "game": 14,
 }
 
+# Rendered text kept around.
+TEXT_CACHE_SIZE = 256
+# Share the images cut out of sprite sheets, see helpers.get_image.
+SLICE_CACHE = True
+
 # Full size(1) for tile_size = 64
 # Half size(0.5)  for tile_size = 32
 TILE_MULT = TILE_SIZE / 64
 
 
+# Pixels per 1/SPEED_RATE of a second. They were tuned at 40 FPS, back
+# when the game moved once per frame.
+SPEED_RATE = 40
 speeds = {
     "player": 3 if not DEBUG_PLAYER else 20,
     "enemy": 2 if not DEBUG_ENEMY else 30,
@@ -24,7 +24,7 @@
 from . import gameinfo
 from . import keys
 from . import setup
-from . components import item, user_interface
+from . components import dirty_rects, item, user_interface
 
 
 class Control:
@@ -33,6 +33,14 @@ def __init__(self, caption: str) -> None:
         self.dt = 0.0
         self.fps = c.FPS
         self.c_fps = 0 # Current FPS from pygame's Clock.
+
+        # Time not yet run by ticks, and the game time of the last tick.
+        self.accumulator = 0.0
+        self.tick_time = 0.0
+
+        # Assets needed soon are loaded in the background after the
+        # first frame.
+        self.warmed_up = False
         pygame.display.set_caption(caption)
         self.clock = pygame.time.Clock()
 
@@ -46,16 +54,15 @@ def __init__(self, caption: str) -> None:
     def game_loop(self) -> None:
         while not self.quit:
             self.update()
-            pygame.display.update()
+            dirty_rects.flush()
+            if not self.warmed_up:
+                if c.DEBUG_ASSETS:
+                    print(setup.startup_report())
+                setup.warm_up()
+                self.warmed_up = True
             self.dt = self.clock.tick(self.fps)
             self.c_fps = self.clock.get_fps()
 
-            # Sync threads with main thread.
-            if self.state_name == c.StateName.COMMONAREA:
-                while not self.state.game_info.thread_queue.empty():
-                    t = self.state.game_info.thread_queue.get()
-                    t.join()
-
         # When the game loop exits, let state clean up game info.
         return self.state.cleanup()
 
@@ -80,16 +87,40 @@ def update(self) -> None:
         elif self.state.state_done:
             self.flip_state()
 
+        self.run_ticks()
         self.state.update(self.screen_surface, self.dt, self.game_time, self.c_fps)
 
         # In Game User Interface.
         self.game_ui.update(self.screen_surface, self.state_name, self.state.game_info)
 
+        if setup.screen_size.changed():
+            dirty_rects.mark_all()
+
         # End of frame. Do resets.
         self.state.game_info.inp.reset()
         setup.screen_size.reset()
 
 
+    def run_ticks(self) -> None:
+        """Run as many fixed ticks as fit in the time since the last
+        frame. The rest is left for the next frame, and tells the state
+        how far the frame is between the last tick and the next."""
+        self.accumulator += self.dt
+        ticks = 0
+        while self.accumulator >= c.TICK_MS:
+            if ticks == c.MAX_TICKS_PER_FRAME:
+                # Too far behind, let the game slow down instead.
+                self.accumulator = 0
+                break
+
+            self.tick_time += c.TICK_MS
+            self.state.tick(c.TICK_MS, self.tick_time)
+            self.accumulator -= c.TICK_MS
+            ticks += 1
+
+        self.state.game_info.interpolation = self.accumulator / c.TICK_MS
+
+
     def setup_states(self, states, start_state) -> None:
         self.states = states
         self.state_name = start_state
@@ -110,6 +141,8 @@ def flip_state(self) -> None:
         self.state.cleanup()
 
         self.state = self.states[self.state_name]
+        dirty_rects.set_background(None)
+        dirty_rects.mark_all()
 
         # Startup state when switching to it with the dumped game info.
         self.state.startup(game_info)
@@ -173,5 +206,12 @@ def startup(self, game_info: gameinfo.GameInfo) -> None:
         raise NotImplementedError
 
 
+    def tick(self, dt: float, game_time: float) -> None:
+        """Move the game ahead by one fixed step of dt milliseconds.
+        States that don't move on their own don't need it."""
+        pass
+
+
     def update(self, surface: pygame.Surface, dt: int) -> None:
+        """Once every frame, after the ticks."""
         raise NotImplementedError
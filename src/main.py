@@ -5,11 +5,16 @@
 from . states import commonarea
 from . states import mainmenu
 
+import multiprocessing
 import sys
 import traceback
 
 
 def main():
+    # Levels are generated in worker processes, which needs this
+    # when the game is frozen into an executable.
+    multiprocessing.freeze_support()
+
     setup.start()
 
     states = {
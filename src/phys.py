@@ -1,5 +1,24 @@
+from typing import Tuple
+
 import math
 
 
 def normalize(x: int, y: int) -> int:
     return math.sqrt(x**2 + y**2) / 2
+
+
+def lerp(start: Tuple[int, int], end: Tuple[int, int], alpha: float) -> Tuple[int, int]:
+    """The point alpha of the way from start to end, rounded."""
+    return (round(start[0] + (end[0] - start[0]) * alpha),
+            round(start[1] + (end[1] - start[1]) * alpha))
+
+
+def sub_pixel_step(distance: float, carry: float) -> Tuple[int, float]:
+    """Whole pixels to move, and the rest to carry to the next step.
+
+    Lets speeds that aren't whole pixels per tick add up right.
+    """
+    total = distance + carry
+    # Rounded first, so float error can't leave 0.999... behind.
+    whole = int(round(total, 9))
+    return whole, total - whole
@@ -1,17 +1,29 @@
-from typing import Any, Optional, Dict, Tuple
+from typing import Any, Optional, Dict, MutableMapping, Tuple
 
+from collections import OrderedDict
 import os
+import time
 
 import pygame
 
+from . import asset_pack
+from . import assets
+from . import atlas
 from . import constants as c
 from . import keys
 from . import tools
 
 
-GFX =   {} # type: Dict[str, pygame.Surface]
-FONTS = {} # type: Dict[str, pygame.font.Font]
-SFX =   {} # type: Dict[str, pygame.mixer.Sound]
+# Registries, each asset is loaded the first time it's used.
+GFX =   {} # type: MutableMapping[str, pygame.Surface]
+FONTS = {} # type: MutableMapping[str, pygame.font.Font]
+SFX =   {} # type: MutableMapping[str, pygame.mixer.Sound]
+
+# Seconds each step of start took.
+startup_times = OrderedDict() # type: OrderedDict
+
+# Decoded graphics, when c.ASSET_PACK is on.
+pack = None # type: Optional[asset_pack.AssetPack]
 
 screen_size = None # type: ScreenSize
 map_size = None # type: MapSize
@@ -102,13 +114,30 @@ def __resize_map(self, biome: c.Biome) -> None:
         """Size the map based on biome. Round to the nearest tile size."""
         if self.__biome != biome:
             self.__biome = biome
-            self.__width = round(c.DEFAULT_SCREEN_WIDTH * c.map_mult[self.__biome] / c.TILE_SIZE) * c.TILE_SIZE
-            self.__height = round(c.DEFAULT_SCREEN_HEIGHT * c.map_mult[self.__biome] / c.TILE_SIZE) * c.TILE_SIZE
+            self.__width, self.__height = self.size_for(biome)
             self.__changed = True
         else:
             self.__changed = False
 
 
+    @staticmethod
+    def size_for(biome: c.Biome) -> Tuple[int, int]:
+        """Map width and height for a biome, without resizing."""
+        if c.CHUNKED_WORLD and biome == c.Biome.FARMLAND:
+            width = c.WORLD_CHUNKS * c.CHUNK_SIZE * c.TILE_SIZE
+            height = c.WORLD_CHUNKS * c.CHUNK_SIZE * c.TILE_SIZE
+        else:
+            width = round(c.DEFAULT_SCREEN_WIDTH * c.map_mult[biome] / c.TILE_SIZE) * c.TILE_SIZE
+            height = round(c.DEFAULT_SCREEN_HEIGHT * c.map_mult[biome] / c.TILE_SIZE) * c.TILE_SIZE
+        return width, height
+
+
+    @classmethod
+    def grid_size_for(cls, biome: c.Biome) -> Tuple[int, int]:
+        width, height = cls.size_for(biome)
+        return int(round(width / c.TILE_SIZE)), int(round(height / c.TILE_SIZE))
+
+
     def __resize_grid(self) -> None:
         if self.__changed:
             # Since the map size gets updated first, if the map size changes,
@@ -153,21 +182,77 @@ def update(self, biome: c.Biome) -> None:
 
 
 def start() -> None:
+    started = time.perf_counter()
+    def done(step: str) -> None:
+        nonlocal started
+        startup_times[step] = time.perf_counter() - started
+        started = time.perf_counter()
+
     os.environ["SDL_VIDEO_CENTERED"] = "1"
     pygame.init()
     pygame.font.init()
 
     # Initialize screen
     _ = pygame.display.set_mode(c.DEFAULT_SCREEN_SIZE, pygame.RESIZABLE)
+    done("display")
 
     global GFX
-    GFX = tools.load_gfx(os.path.join("data", "graphics"))
+    files = tools.index_gfx(os.path.join("data", "graphics"))
+    # Images in a texture atlas are cut out of their sheet, instead of
+    # loaded from their own file.
+    regions = atlas.index_atlases(os.path.join("data", "xmlsheets", "ui_pack_xml"), files)
+    files = {name: path for name, path in files.items() if name not in regions}
+    done("index graphics")
+
+    decode_file = pygame.image.load
+    if c.ASSET_PACK:
+        global pack
+        pack = asset_pack.AssetPack(files)
+        decode_file = pack.decode
+        done("open pack")
+
+    def decode_gfx(source: Any) -> Optional[pygame.Surface]:
+        if isinstance(source, atlas.Region):
+            # Cut out of the sheet when finished.
+            return None
+        return decode_file(source)
+
+    def finish_gfx(source: Any, image: Optional[pygame.Surface]) -> pygame.Surface:
+        if isinstance(source, atlas.Region):
+            return GFX[source.sheet].subsurface(source.rect)
+        return tools.prepare_image(image)
+
+    GFX = assets.Registry(dict(files, **regions), decode_gfx, finish_gfx)
     global FONTS
-    FONTS = tools.load_fonts(os.path.join("data", "fonts"))
+    FONTS = assets.Registry(tools.index_fonts(os.path.join("data", "fonts")), tools.load_font)
     global SFX
-    SFX = tools.load_sfx(os.path.join("data", "sounds"))
+    SFX = assets.Registry(tools.index_sfx(os.path.join("data", "sounds")), pygame.mixer.Sound)
+    done("index fonts and sounds")
 
     global screen_size
     screen_size = ScreenSize()
     global map_size
     map_size = MapSize()
+
+
+def warm_up() -> None:
+    """Start loading the graphics the game needs right after the menu, and
+    building a stale pack, in the background. Call once the first frame
+    is up, so it doesn't slow that one down."""
+    if pack is not None:
+        pack.rebuild()
+
+    if not c.WARM_UP_ASSETS or not isinstance(GFX, assets.Registry):
+        return
+
+    names = [name for name in c.WARM_UP_GFX if name in GFX.sources]
+    for name, source in GFX.sources.items():
+        if isinstance(source, str) and os.path.basename(os.path.dirname(source)) in c.WARM_UP_GFX_FOLDERS:
+            names.append(name)
+    GFX.warm_up(names)
+
+
+def startup_report() -> str:
+    lines = ["{}: {:.1f} ms".format(step, seconds * 1000) for step, seconds in startup_times.items()]
+    lines.append(assets.report({"graphics": GFX, "fonts": FONTS, "sounds": SFX}))
+    return "\n".join(lines)
@@ -1,9 +1,8 @@
-from typing import Any, Dict, Iterable, List, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
+from concurrent import futures
 import time
-import threading
 import random
-import queue
 
 import pygame
 
@@ -11,10 +10,11 @@
 from .. import constants as c
 from .. import control
 from .. import gameinfo
+from .. import phys
 from .. import setup
 from .. import tools
 
-from .. components import item, non_player_controlled, player, scenery, tilemap, user_interface
+from .. components import dirty_rects, item, levels, non_player_controlled, player, render_list, render_worker, scenery, tilemap, user_interface, world
 
 
 class CommonArea(control.State):
@@ -28,6 +28,10 @@ def __init__(self) -> None:
         super().__init__()
 
         self.biome = setup.map_size.get_biome()
+
+        # Future of the next level's MapData, from the stairs taken.
+        self.next_level = None # type: Optional[futures.Future]
+
         self.tilemap = self.setup_map(self.biome)
 
         # There will be no stairs up on map initializing.
@@ -44,11 +48,15 @@ def startup(self, game_info: gameinfo.GameInfo) -> None:
         self.state = c.StateName.COMMONAREA
 
         self.game_info.tilemap = self.tilemap
-        self.game_info.thread_queue = queue.Queue() # type: queue.Queue
 
         self.game_info.item_gen_proc = item.ItemGenerator()
         self.game_info.item_gen_proc.start()
 
+        self.game_info.level_gen_proc = levels.LevelGenerator()
+
+        self.game_info.render_worker = render_worker.RenderWorker()
+        self.game_info.render_worker.start()
+
         # Trigger a screen size change to setup everything at the
         # current screen size.
         setup.screen_size.trigger_change()
@@ -58,17 +66,40 @@ def startup(self, game_info: gameinfo.GameInfo) -> None:
 
         self.setup_player()
         self.npc_group = self.setup_npcs()
+        self.fill_render_list()
 
         self.setup_camera()
         self.setup_hud()
 
+        # Camera and moving sprite locations before the last tick.
+        self.previous_camera = self.camera.topleft
+        self.previous_locations = {} # type: Dict[pygame.sprite.Sprite, Tuple[int, int]]
+
+        # For dirty rects, the world as last drawn, and where from.
+        self.view = None # type: Optional[pygame.Surface]
+        self.drawn_from = None # type: Optional[Tuple[Tuple[int, int], tilemap.Map]]
+        # Sprite to its rect, image and the area the image covered.
+        self.drawn = {} # type: Dict[pygame.sprite.Sprite, Tuple[pygame.Rect, pygame.Surface, pygame.Rect]]
+
 
     def setup_map(self, biome: c.Biome) -> tilemap.Map:
-        temp_map = tilemap.Map(setup.map_size.get_grid_width(), setup.map_size.get_grid_height(), setup.map_size.get_width(), setup.map_size.get_height(), biome)
+        data = None
+        if self.next_level is not None:
+            # Generated in the background, usually done long before the
+            # player finds the stairs. Generated here when it failed.
+            data = levels.result(self.next_level)
+            self.next_level = None
+
+        seed = None
+        if biome == c.Biome.FARMLAND:
+            seed = c.MAP_SEED
+
+        if c.CHUNKED_WORLD and biome == c.Biome.FARMLAND:
+            temp_map = world.ChunkedMap(setup.map_size.get_grid_width(), setup.map_size.get_grid_height(), biome, seed)
+        else:
+            temp_map = tilemap.Map(setup.map_size.get_grid_width(), setup.map_size.get_grid_height(), setup.map_size.get_width(), setup.map_size.get_height(), biome, data, seed)
         self.collidable_grid = temp_map.create_collidables()
-        self.tilemap_rect = temp_map.map_surface.get_rect()
-        self.entire_area = pygame.Surface((self.tilemap_rect.width, self.tilemap_rect.height)).convert()
-        self.entire_area_rect = self.entire_area.get_rect()
+        self.tilemap_rect = temp_map.rect
         return temp_map
 
 
@@ -118,10 +149,15 @@ def setup_stairs_down(self) -> pygame.sprite.Group:
             x, y = self.tilemap.find_random_open_location()
             # Stairs should draw over bushes, so don't worry about the fact
             # that an "open location" only means no collidables.
-            temp_group.add(scenery.Stairs(x, y, "stairs_down"))
+            stairs = scenery.Stairs(x, y, "stairs_down")
+            temp_group.add(stairs)
+
+            # Start generating the cave below right away.
+            grid_width, grid_height = setup.MapSize.grid_size_for(c.Biome.CAVE)
+            stairs.level = self.game_info.level_gen_proc.submit(grid_width, grid_height, c.Biome.CAVE)
 
             # XXX Collidables for stairs should probably be handled by tilemap.
-            self.collidable_grid[int(x/c.TILE_SIZE)][int(y/c.TILE_SIZE)] = 1
+            self.collidable_grid.set(int(x/c.TILE_SIZE), int(y/c.TILE_SIZE), 1)
 
         return temp_group
 
@@ -137,36 +173,48 @@ def setup_stairs_up(self) -> None:
         self.stairs_up_group.add(scenery.Stairs(x, y, "stairs_up"))
 
         # XXX Collidables for stairs should probably be handled by tilemap.
-        self.collidable_grid[int(x/c.TILE_SIZE)][int(y/c.TILE_SIZE)] = 1
+        self.collidable_grid.set(int(x/c.TILE_SIZE), int(y/c.TILE_SIZE), 1)
         #self.collidable_group.add(util.Collidable(x, y))
 
 
+    def fill_render_list(self) -> None:
+        """Add the stairs, NPCs and player to the current map's render
+        list. Ones already in it are skipped."""
+        render = self.tilemap.render_list
+        render.add_to_layer(render_list.GROUND, *self.stairs_down_group, *self.stairs_up_group)
+        render.add_to_layer(render_list.ENTITIES, *self.npc_group, self.player, moving=True)
+
+
     def setup_hud(self) -> None:
         self.hud = user_interface.Hud()
 
 
+    def tick(self, dt: float, game_time: float) -> None:
+        """ Move the game ahead by one fixed step. """
+        self.remember_positions()
+
+        self.game_info.dt = dt
+        self.game_info.game_time = game_time
+
+        self.update_sprites()
+        self.move_camera()
+
+
     def update(self, surface: pygame.Surface, dt: int, game_time: int, c_fps: int) -> None:
         """ Update the state every frame. """
         #self.blit_images(surface)
-        draw_thread = threading.Thread(target=self.blit_images, args=(surface,))
-        self.game_info.thread_queue.put(draw_thread)
-        draw_thread.start()
 
         # Let this state control the map size update.
         setup.map_size.update(self.biome)
 
-        self.game_info.dt = dt
-        self.game_info.game_time = game_time
-
         self.update_sizes()
         self.update_map()
-        self.update_sprites()
         self.handle_states()
-        #self.blit_images(surface)
+        self.blit_images(surface)
 
         # Draw the hud to the screen over everything else.
         # Similar to Game UI but the hud needs access to game_info.
-        self.hud.update(surface, c_fps, self.player, self.tilemap_rect.bottom)
+        self.hud.update(surface, c_fps, self.player, self.tilemap_rect.bottom, self.tilemap.minimap, self.npc_group.sprites())
 
         #self.periodic_videoresize(dt)
 
@@ -174,8 +222,14 @@ def update(self, surface: pygame.Surface, dt: int, game_time: int, c_fps: int) -
     def handle_states(self) -> None:
         if self.game_info.inp.pressed("escape"):
             self.quit = True
-        else:
-            self.move_camera()
+
+
+    def remember_positions(self) -> None:
+        """Where things were before a tick, to draw frames between ticks."""
+        self.previous_camera = self.camera.topleft
+        self.previous_locations.clear()
+        for sprite in self.tilemap.render_list.moving:
+            self.previous_locations[sprite] = sprite.rect.topleft
 
 
     def update_sizes(self) -> None:
@@ -198,14 +252,20 @@ def update_map(self) -> None:
                 stairs.kill()
 
             self.setup_stairs_up()
+            self.fill_render_list()
 
 
     def update_sprites(self) -> None:
         self.player_group.update(self.game_info, self.collidable_grid)
         self.npc_group.update(self.game_info.dt, self.game_info.game_time, self.collidable_grid)
         self.stairs_down_group.update(self.player.rect)
+        self.tilemap.render_list.refresh()
 
+        # Tree bottoms are baked into the map, remember them to find
+        # out which ones were cut.
+        tree_bottoms = [] # type: List[pygame.sprite.Sprite]
         if not self.game_info.action_attempts.empty():
+            tree_bottoms = self.tilemap.tree_bottom_group.sprites()
             tree_bottom_collided = pygame.sprite.spritecollideany(self.game_info.player, self.tilemap.tree_bottom_group)
             # The player sent an action and the player is colliding with a lootable object.
             if tree_bottom_collided:
@@ -215,11 +275,17 @@ def update_sprites(self) -> None:
         self.tilemap.tree_bottom_group.update(self.game_info)
         self.tilemap.tree_top_group.update(self.game_info)
 
+        for tree_bottom in tree_bottoms:
+            if tree_bottom.dead:
+                self.tilemap.invalidate(tree_bottom.rect)
+                self.drawn_from = None
+
         # XXX separate into: def handle_biome(self)
         for stairs_down in self.stairs_down_group:
             # Check stairs state change.
-            if stairs_down.hit:
+            if stairs_down.hit and self.biome != c.Biome.CAVE:
                 self.biome = c.Biome.CAVE
+                self.next_level = stairs_down.level
 
         # If in cave, check for a hit on stairs up.
         if self.biome == c.Biome.CAVE:
@@ -237,6 +303,7 @@ def update_sprites(self) -> None:
 
                     if not self.stairs_down_group:
                         self.stairs_down_group = self.setup_stairs_down() # or just try over-writing the stairs_down group that is empty with new stairs!
+                    self.fill_render_list()
 
                     # And kill stairs up.
                     for stairs in self.stairs_up_group:
@@ -350,16 +417,93 @@ def set_camera_velocity(self) -> None:
 
 
     def blit_images(self, surface: pygame.Surface) -> None:
-        # This is responsible for showing only a certain area
-        # of the tilemap surface, the area shown is the area of the camera.
-        self.entire_area.blit(self.tilemap.map_surface, self.camera, self.camera)
+        if c.DIRTY_RECTS:
+            # The HUD repaints the world under it, so the world is drawn
+            # right away instead of by the worker.
+            self.blit_dirty(surface)
+            return
 
-        self.tilemap.update(self.entire_area, self.camera)
+        worker = self.game_info.render_worker
+        worker.submit(self.snapshot())
+        worker.present(surface)
 
-        tools.draw_visible(self.entire_area, self.camera, [self.stairs_down_group, self.stairs_up_group, self.npc_group, self.player_group, self.tilemap.tree_top_group])
 
-        # Finally, draw everything to the screen surface.
-        surface.blit(self.entire_area, (0, 0), self.camera)
+    def snapshot(self) -> render_worker.Frame:
+        """Everything the render worker needs to draw this frame.
+
+        Positions are between the last two ticks, by how far this frame
+        is between the last tick and the next.
+        """
+        alpha = self.game_info.interpolation
+        camera = pygame.rect.Rect(phys.lerp(self.previous_camera, self.camera.topleft, alpha), self.camera.size)
+        sprites = self.tilemap.render_list.snapshot(camera, offset=camera.topleft, previous=self.previous_locations, alpha=alpha)
+        return render_worker.Frame(self.tilemap, tuple(camera), sprites)
+
+
+    def draw_world(self, surface: pygame.Surface, area: pygame.Rect) -> None:
+        """Draw the part of the map inside area onto a screen sized
+        surface, moved by the camera."""
+        offset = self.camera.topleft
+        self.tilemap.update(surface, area, offset=offset)
+        self.tilemap.render_list.render(surface, area, offset=offset)
+
+
+    def blit_dirty(self, surface: pygame.Surface) -> None:
+        """Draw the world into a view kept between frames, then only
+        the parts of it that changed to the screen.
+
+        Everything is drawn when the camera moved or the map changed.
+        """
+        regions = self.dirty_regions()
+
+        if regions is None:
+            if self.view is None or self.view.get_size() != surface.get_size():
+                self.view = pygame.Surface(surface.get_size()).convert()
+            self.draw_world(self.view, self.camera)
+            surface.blit(self.view, (0, 0))
+            dirty_rects.mark_all()
+        else:
+            for region in dirty_rects.merge(regions):
+                # Only the sprites inside the region can be drawn, not all
+                # of the ones touching it.
+                self.view.set_clip(region)
+                self.draw_world(self.view, region.move(self.camera.topleft))
+                surface.blit(self.view, region, region)
+                dirty_rects.mark(region)
+            self.view.set_clip(None)
+
+        self.drawn_from = (self.camera.topleft, self.tilemap)
+        dirty_rects.set_background(self.view)
+
+
+    def dirty_regions(self) -> Optional[List[pygame.Rect]]:
+        """Screen rects of the moving sprites that changed since they
+        were last drawn, or None when everything must be drawn."""
+        offset_x, offset_y = self.camera.topleft
+        full = (self.view is None or self.view.get_size() != self.camera.size or self.drawn_from != (self.camera.topleft, self.tilemap))
+        if full:
+            self.drawn = {}
+
+        regions = [] # type: List[pygame.Rect]
+        for sprite in self.tilemap.render_list.moving:
+            last = self.drawn.get(sprite)
+            if last is None or last[0] != sprite.rect or last[1] is not sprite.image:
+                # Walking frames can be wider than the rect, so the image
+                # is drawn past it.
+                area = sprite.rect.union(sprite.image.get_rect(topleft=sprite.rect.topleft))
+                rect = area.move(-offset_x, -offset_y)
+                if last is not None:
+                    rect.union_ip(last[2].move(-offset_x, -offset_y))
+                regions.append(rect)
+                self.drawn[sprite] = (pygame.rect.Rect(sprite.rect), sprite.image, area)
+
+        return None if full else regions
+
+
+    def cleanup(self) -> None:
+        self.game_info.level_gen_proc.cleanup()
+        self.game_info.render_worker.cleanup()
+        super().cleanup()
 
 
     def periodic_videoresize(self, dt: int) -> None:
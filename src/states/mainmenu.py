@@ -7,7 +7,7 @@
 from .. import control
 from .. import gameinfo
 from .. import setup
-from .. components import user_interface
+from .. components import dirty_rects, user_interface
 
 
 class MainMenu(control.State):
@@ -32,6 +32,10 @@ def startup(self, game_info: gameinfo.GameInfo) -> None:
         flipped back to from the main game."""
         self.game_info = game_info
         self.next = self.set_next_state()
+
+        # The menu only changes with the selection.
+        self.drawn_selection = None # type: str
+
         self.setup_background()
         self.re_setup_menu()
 
@@ -135,3 +139,7 @@ def blit_images(self, surface: pygame.Surface) -> None:
 
         for menu_item in self.menu_list:
             menu_item.render_name(surface)
+
+        if self.selection != self.drawn_selection:
+            self.drawn_selection = self.selection
+            dirty_rects.mark_all()
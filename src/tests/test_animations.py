@@ -0,0 +1,46 @@
+from ..components import animations, helpers
+from .. import constants as c
+from .. import setup
+
+import unittest
+
+import pygame
+
+
+class TestAnimations(unittest.TestCase):
+    def setUp(self) -> None:
+        animations.clear()
+        self.gfx = setup.GFX.get("hero")
+        setup.GFX["hero"] = pygame.Surface((1024, 1024), pygame.SRCALPHA, 32)
+
+
+    def tearDown(self) -> None:
+        animations.clear()
+        if self.gfx is None:
+            del setup.GFX["hero"]
+        else:
+            setup.GFX["hero"] = self.gfx
+
+
+    def test_shared(self) -> None:
+        cut = helpers.report()
+        up = animations.get("hero", c.Direction.UP, c.NPC_MULT)
+        # Kept once, by animations.
+        assert(helpers.report() == cut)
+        assert(len(up) == 5)
+        # The placeholder frame is the first frame.
+        assert(up[0] is up[1])
+        assert(up[1].get_size() == (int(98 * c.NPC_MULT), int(202 * c.NPC_MULT)))
+
+        assert(animations.get("hero", c.Direction.UP, c.NPC_MULT) is up)
+        assert(animations.get("hero", c.Direction.UP, 1) is not up)
+
+
+    def test_directions(self) -> None:
+        frames = animations.directions("hero", c.NPC_MULT)
+        assert(len(frames) == 8)
+        assert(frames[c.Direction.LEFTUP] is frames[c.Direction.LEFT])
+        assert(frames[c.Direction.RIGHTDOWN] is frames[c.Direction.RIGHT])
+
+        # 4 directions of 4 distinct frames, at one size.
+        assert(animations.report()[0] == 16)
@@ -0,0 +1,57 @@
+from .. import asset_pack
+
+import os
+import tempfile
+import unittest
+
+import pygame
+
+
+class TestAssetPack(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        # Loaded images are converted for the display.
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        pygame.display.init()
+        pygame.display.set_mode((1, 1))
+
+
+    def test_round_trip(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            image = pygame.Surface((5, 3), pygame.SRCALPHA, 32)
+            image.fill((10, 20, 30, 40))
+            image.set_at((4, 2), (200, 100, 50, 255))
+            source = os.path.join(directory, "thing.png")
+            pygame.image.save(image, source)
+
+            path = os.path.join(directory, "graphics.pack")
+            pack = asset_pack.AssetPack({"thing": source}, path)
+            assert(pack.stale)
+            pack.rebuild(background=False)
+
+            pack = asset_pack.AssetPack({"thing": source}, path)
+            assert(not pack.stale)
+            loaded = pack.load(source)
+            assert(loaded.get_size() == (5, 3))
+            assert(pygame.image.tobytes(loaded, "RGBA") == pygame.image.tobytes(image, "RGBA"))
+            pack.close()
+
+            # Loaded surfaces are writable, and outlive the pack.
+            loaded.fill((1, 2, 3, 4))
+            loaded.blit(image, (0, 0))
+            assert(loaded.get_at((4, 2)) == (200, 100, 50, 255))
+
+            # Touching the source makes the pack stale.
+            stat = os.stat(source)
+            os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+            assert(asset_pack.AssetPack({"thing": source}, path).stale)
+
+
+    def test_broken_pack(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "graphics.pack")
+            with open(path, "wb") as f:
+                f.write(b"GPAK\x01")
+
+            pack = asset_pack.AssetPack({}, path)
+            assert(pack.entries == {})
@@ -0,0 +1,60 @@
+from .. import assets
+
+import threading
+import unittest
+
+
+class TestRegistry(unittest.TestCase):
+    def setUp(self) -> None:
+        self.loads = [] # type: list
+        def load(source: str) -> str:
+            self.loads.append(source)
+            return source.upper()
+        self.registry = assets.Registry({"a": "a.png", "b": "b.png"}, load)
+
+
+    def test_lazy(self) -> None:
+        assert("a" in self.registry)
+        assert(len(self.registry) == 2)
+        assert(self.loads == [])
+
+        assert(self.registry["a"] == "A.PNG")
+        assert(self.registry["a"] == "A.PNG")
+        assert(self.loads == ["a.png"])
+        assert(self.registry.loaded("a") and not self.registry.loaded("b"))
+
+        with self.assertRaises(KeyError):
+            self.registry["c"]
+
+
+    def test_set_and_delete(self) -> None:
+        self.registry["c"] = "C"
+        assert(sorted(self.registry) == ["a", "b", "c"])
+
+        del self.registry["a"]
+        assert("a" not in self.registry)
+        assert(self.registry.get("a") is None)
+        assert(self.loads == [])
+
+
+    def test_warm_up(self) -> None:
+        self.registry.warm_up(["b", "missing"], background=False)
+        assert(self.loads == ["b.png"])
+
+        self.registry.warm_up(["a", "b"]).join()
+        assert(sorted(self.loads) == ["a.png", "b.png"])
+
+
+    def test_finish(self) -> None:
+        finished = [] # type: list
+        def finish(source: str, decoded: str) -> str:
+            finished.append((source, threading.current_thread()))
+            return decoded + "!"
+        registry = assets.Registry({"a": "a.png"}, str.upper, finish)
+
+        # Decoded by the warm up, finished by the thread reading it.
+        registry.warm_up(["a"]).join()
+        assert(finished == [] and not registry.loaded("a"))
+        assert(registry["a"] == "A.PNG!")
+        assert(finished == [("a.png", threading.current_thread())])
+        assert("a" in registry.timings)
@@ -0,0 +1,27 @@
+from .. import atlas
+
+import os
+import tempfile
+import unittest
+
+
+ATLAS = """<TextureAtlas imagePath="sheet.png">
+    <SubTexture name="green_button00.png" x="0" y="0" width="190" height="49"/>
+    <SubTexture name="green_tick.png" x="386" y="210" width="36" height="36"/>
+</TextureAtlas>
+"""
+
+
+class TestAtlas(unittest.TestCase):
+    def test_index(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            for name in ["greenSheet.xml", "blueSheet.xml"]:
+                with open(os.path.join(directory, name), "w") as f:
+                    f.write(ATLAS)
+
+            # Only atlases of sheets that exist.
+            regions = atlas.index_atlases(directory, {"greenSheet": "greenSheet.png"})
+            assert(regions == {
+                "green_button00": atlas.Region("greenSheet", (0, 0, 190, 49)),
+                "green_tick": atlas.Region("greenSheet", (386, 210, 36, 36)),
+            })
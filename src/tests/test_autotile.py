@@ -0,0 +1,169 @@
+from ..components import autotile
+from .. import constants as c
+
+import unittest
+
+import numpy as np
+
+
+class OldTilemap:
+    """ The branch chain that autotile replaced, kept as a reference.
+
+    Corner cuts are recorded as directions instead of creating sprites.
+    """
+    def __init__(self, grid):
+        self.grid = grid
+        self.corners = []
+
+
+    def create_corner(self, x, y, movex, movey, flipx, flipy):
+        assert((movex, movey) == (flipx, flipy))
+        for corner_dir, move in autotile.CORNER_CUTS.items():
+            if move == (movex, movey):
+                self.corners.append(corner_dir)
+
+
+    def solid_tilename_calculation(self, x, y, create_corner_cuts):
+        water_choices = autotile.WATER_CHOICES
+        water_corners = autotile.WATER_CORNERS
+        self.corners = []
+
+        num_directions = 8
+        init_ones = [0 for _ in range(0, num_directions)]
+        up, down, left, right, leftup, rightup, leftdown, rightdown = init_ones
+        try:
+            up = self.grid[x][y-1]      # Tile above.
+            down = self.grid[x][y+1]    # Tile below.
+            right = self.grid[x+1][y]   # Tile to the right.
+            left = self.grid[x-1][y]    # Tile to the left.
+            leftup = self.grid[x-1][y-1]
+            rightup = self.grid[x+1][y-1]
+            leftdown = self.grid[x-1][y+1]
+            rightdown = self.grid[x+1][y+1]
+        except IndexError:
+            pass
+
+        swapped = False
+        tilename = water_choices[c.Direction.NONE]
+        if up and down and left and right:
+            if leftup and rightup and leftdown and rightdown:
+                return water_choices[c.Direction.NONE], swapped
+            elif not leftup and not rightdown:
+                if create_corner_cuts:
+                    self.create_corner(x, y, movex=False, movey=False, flipx=False, flipy=False)
+                    self.create_corner(x, y, movex=True, movey=True, flipx=True, flipy=True)
+            elif not leftdown and not rightup:
+                if create_corner_cuts:
+                    self.create_corner(x, y, movex=False, movey=True, flipx=False, flipy=True)
+                    self.create_corner(x, y, movex=True, movey=False, flipx=True, flipy=False)
+            elif leftup and rightup and leftdown and not rightdown:
+                return water_corners[c.Direction.RIGHTDOWN], swapped
+            elif leftup and rightup and not leftdown and rightdown:
+                return water_corners[c.Direction.LEFTDOWN], swapped
+            elif leftup and not rightup and leftdown and rightdown:
+                return water_corners[c.Direction.RIGHTUP], swapped
+            elif not leftup and rightup and leftdown and rightdown:
+                return water_corners[c.Direction.LEFTUP], swapped
+        elif down and left and right and not up:
+            if create_corner_cuts:
+                if not leftdown:
+                    self.create_corner(x, y, movex=False, movey=True, flipx=False, flipy=True)
+                if not rightdown:
+                    self.create_corner(x, y, movex=True, movey=True, flipx=True, flipy=True)
+            return water_choices[c.Direction.UP], swapped
+        elif up and left and right and not down:
+            if create_corner_cuts:
+                if not leftup:
+                    self.create_corner(x, y, movex=False, movey=False, flipx=False, flipy=False)
+                if not rightup:
+                    self.create_corner(x, y, movex=True, movey=False, flipx=True, flipy=False)
+            return water_choices[c.Direction.DOWN], swapped
+        elif up and down and right and not left:
+            if create_corner_cuts:
+                if not rightdown:
+                    self.create_corner(x, y, movex=True, movey=True, flipx=True, flipy=True)
+                if not rightup:
+                    self.create_corner(x, y, movex=True, movey=False, flipx=True, flipy=False)
+            return water_choices[c.Direction.LEFT], swapped
+        elif up and down and left and not right:
+            if create_corner_cuts:
+                if not leftdown:
+                    self.create_corner(x, y, movex=False, movey=True, flipx=False, flipy=True)
+                if not leftup:
+                    self.create_corner(x, y, movex=False, movey=False, flipx=False, flipy=False)
+            return water_choices[c.Direction.RIGHT], swapped
+        elif not right and not up and left and down:
+            if create_corner_cuts:
+                if not leftdown:
+                    self.create_corner(x, y, movex=False, movey=True, flipx=False, flipy=True)
+            return water_choices[c.Direction.RIGHTUP], swapped
+        elif not left and not up and right and down:
+            if create_corner_cuts:
+                if not rightdown:
+                    self.create_corner(x, y, movex=True, movey=True, flipx=True, flipy=True)
+            return water_choices[c.Direction.LEFTUP], swapped
+        elif not right and not down and left and up:
+            if create_corner_cuts:
+                if not leftup:
+                    self.create_corner(x, y, movex=False, movey=False, flipx=False, flipy=False)
+            return water_choices[c.Direction.RIGHTDOWN], swapped
+        elif not left and not down and right and up:
+            if create_corner_cuts:
+                if not rightup:
+                    self.create_corner(x, y, movex=True, movey=False, flipx=True, flipy=False)
+            return water_choices[c.Direction.LEFTDOWN], swapped
+        else:
+            self.grid[x][y] = 0
+            swapped = True
+            tilename = "grass"
+            return tilename, swapped
+
+        return tilename, swapped
+
+
+class TestAutotile(unittest.TestCase):
+    def setUp(self) -> None:
+        self.rng = np.random.RandomState(2018)
+
+
+    def random_grids(self):
+        for width, height in [(3, 3), (17, 11), (40, 30)]:
+            for chance in [2, 3, 5]:
+                cells = (self.rng.randint(0, chance, size=(width, height)) != 0).astype(np.uint8)
+                yield cells
+
+
+    def test_table_matches_old_rules(self) -> None:
+        """ Name, swap and corner cuts match for every cell, edges included. """
+        for cells in self.random_grids():
+            masks = autotile.neighbor_masks(cells)
+            width, height = cells.shape
+            for x in range(width):
+                for y in range(height):
+                    old = OldTilemap(cells.tolist())
+                    name, swapped = old.solid_tilename_calculation(x, y, True)
+
+                    mask = masks[x, y]
+                    assert(autotile.TILE_NAMES[autotile.TILE_TABLE[mask]] == name)
+                    assert(autotile.SWAP_TABLE[mask] == swapped)
+                    assert(list(autotile.CORNER_TABLE[mask]) == old.corners)
+
+
+    def test_settle_matches_old_swap_passes(self) -> None:
+        """ Old passes repeated until nothing swaps give the same grid. """
+        for cells in self.random_grids():
+            old = OldTilemap(cells.tolist())
+            width, height = cells.shape
+            swapping = True
+            while swapping:
+                swapping = False
+                for y in range(height):
+                    for x in range(width):
+                        if old.grid[x][y]:
+                            __, swapped = old.solid_tilename_calculation(x, y, False)
+                            swapping = swapping or swapped
+
+            masks = autotile.settle(cells)
+            assert(cells.tolist() == old.grid)
+            assert((masks == autotile.neighbor_masks(cells)).all())
+            assert(not (cells.astype(bool) & autotile.SWAP_TABLE[masks]).any())
@@ -0,0 +1,23 @@
+from ..benchmarks import mapgen
+
+import unittest
+
+
+def results(**phases):
+    return {"results": {"farmland@1x": {"phases": phases}}}
+
+
+class TestMapgenCompare(unittest.TestCase):
+    def test_flags_slower_phases(self) -> None:
+        old = results(place=0.100, random_init=0.010)
+        new = results(place=0.150, random_init=0.0105)
+        regressions = mapgen.compare(old, new, 0.10)
+        assert(len(regressions) == 1)
+        assert("place" in regressions[0])
+
+
+    def test_ignores_noise_and_missing(self) -> None:
+        old = results(place=0.0001)
+        new = results(place=0.0005, bake=1.0)
+        assert(mapgen.compare(old, new, 0.10) == [])
+        assert(mapgen.compare(old, {"results": {}}, 0.10) == [])
@@ -0,0 +1,14 @@
+from ..components import dirty_rects
+
+import unittest
+
+import pygame
+
+
+class TestDirtyRects(unittest.TestCase):
+    def test_merge(self) -> None:
+        rects = [pygame.rect.Rect(0, 0, 10, 10), pygame.rect.Rect(50, 50, 10, 10), pygame.rect.Rect(5, 5, 10, 10), pygame.rect.Rect(14, 14, 40, 40)]
+        assert(dirty_rects.merge(rects) == [pygame.rect.Rect(0, 0, 60, 60)])
+
+        rects = [pygame.rect.Rect(0, 0, 10, 10), pygame.rect.Rect(10, 0, 10, 10)]
+        assert(dirty_rects.merge(rects) == rects)
@@ -0,0 +1,74 @@
+from ..components import generation
+
+import unittest
+
+import numpy as np
+
+
+def count_alive_neighbors(grid, x, y):
+    """ The original per cell neighbor count, used as a reference. """
+    width, height = grid.shape
+    count = 0
+    for i in range(-1, 2):
+        for j in range(-1, 2):
+            neighbor_x = x+i
+            neighbor_y = y+j
+
+            if i == 0 and j == 0:
+                pass
+            elif neighbor_x < 0 or neighbor_y < 0 or neighbor_x >= width or neighbor_y >= height:
+                count += 1
+            elif grid[neighbor_x][neighbor_y] > 0:
+                count += 1
+
+    return count
+
+
+class TestGeneration(unittest.TestCase):
+    def setUp(self) -> None:
+        self.rng = np.random.RandomState(1234)
+        self.grid = generation.random_grid(23, 17, self.rng)
+
+
+    def test_random_grid_shape(self) -> None:
+        """ Grids are indexed grid[x][y] """
+        assert(self.grid.shape == (23, 17))
+        assert(self.grid.dtype == np.uint8)
+        assert(set(np.unique(self.grid)) <= {0, 1})
+
+
+    def test_count_alive_neighbors(self) -> None:
+        """ Out of bounds neighbors count as alive. """
+        counts = generation.count_alive_neighbors(self.grid)
+        for x in range(23):
+            for y in range(17):
+                assert(counts[x][y] == count_alive_neighbors(self.grid, x, y))
+
+        empty = np.zeros((3, 3), dtype=np.uint8)
+        counts = generation.count_alive_neighbors(empty)
+        assert(counts[0][0] == 5)
+        assert(counts[1][0] == 3)
+        assert(counts[1][1] == 0)
+
+
+    def test_simulation_step_double_buffered(self) -> None:
+        """ Every cell is decided from the previous step only. """
+        death_limit, birth_limit = 4, 6
+        before = self.grid.copy()
+        after = generation.simulation_step(self.grid, death_limit, birth_limit)
+
+        assert((self.grid == before).all())
+        for x in range(23):
+            for y in range(17):
+                neighbors = count_alive_neighbors(before, x, y)
+                if before[x][y]:
+                    expected = death_limit <= neighbors <= birth_limit
+                else:
+                    expected = neighbors > birth_limit
+                assert(after[x][y] == int(expected))
+
+
+    def test_simulate_is_reproducible(self) -> None:
+        first = generation.simulate(generation.random_grid(40, 30, np.random.RandomState(7)), 4, 4, 6)
+        second = generation.simulate(generation.random_grid(40, 30, np.random.RandomState(7)), 4, 4, 6)
+        assert((first == second).all())
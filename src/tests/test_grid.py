@@ -0,0 +1,70 @@
+from ..components import grid
+
+import pickle
+import unittest
+
+import numpy as np
+
+
+class TestGrid(unittest.TestCase):
+    def setUp(self) -> None:
+        self.grid = grid.Grid(5, 3)
+
+
+    def test_get_and_set(self) -> None:
+        self.grid.set(4, 2, 7)
+        assert(self.grid.get(4, 2) == 7)
+        assert(self.grid.get_unchecked(4, 2) == 7)
+        assert(self.grid.array[4, 2] == 7)
+        assert(self.grid[4][2] == 7)
+
+
+    def test_bounds_checked(self) -> None:
+        """ Negative points are out of bounds too. """
+        for x, y in [(5, 0), (0, 3), (-1, 0), (0, -1)]:
+            try:
+                self.grid.get(x, y)
+            except IndexError:
+                pass
+            else:
+                raise Exception("Grid.get should raise for {}".format((x, y)))
+
+
+    def test_list_compatible_indexing(self) -> None:
+        """ grid[x][y] wraps negative indices like the old lists did. """
+        lists = [[x * 3 + y for y in range(3)] for x in range(5)]
+        g = grid.Grid.from_lists(lists)
+        assert(g.tolist() == lists)
+        assert(g[-1][-1] == lists[-1][-1])
+        assert(g[0][-1] == lists[0][-1])
+
+
+    def test_views_share_memory(self) -> None:
+        self.grid.row(1)[:] = 1
+        self.grid.region(1, 0, 2, 3)[:, :] = 2
+        assert(self.grid.count(2) == 6)
+        assert(self.grid.count(1) == 3)
+        assert(bytes(self.grid.buffer()[:3]) == b"\x00\x01\x00")
+        assert(list(self.grid.column(1)) == [2, 2, 2])
+
+
+    def test_copy_and_fill(self) -> None:
+        self.grid.fill(3)
+        other = self.grid.copy()
+        assert(other == self.grid)
+
+        other.set(0, 0, 0)
+        assert(other != self.grid)
+        assert(np.asarray(self.grid).sum() == 3 * 15)
+        assert(list(other.points(0)) == [(0, 0)])
+
+
+    def test_pickle(self) -> None:
+        """ Grids are sent between processes, the array view must come
+        back sharing memory again. """
+        self.grid.set(4, 2, 9)
+        other = pickle.loads(pickle.dumps(self.grid))
+        assert(other == self.grid)
+
+        other.set(0, 1, 5)
+        assert(other.array[0, 1] == 5)
@@ -0,0 +1,33 @@
+from ..components import helpers
+
+import unittest
+
+import pygame
+
+
+class TestGetImage(unittest.TestCase):
+    def setUp(self) -> None:
+        helpers.clear()
+        self.sheet = pygame.Surface((64, 32), pygame.SRCALPHA, 32)
+        self.sheet.fill((200, 10, 10, 255), (32, 0, 32, 32))
+
+
+    def test_shared(self) -> None:
+        first = helpers.get_image(32, 0, 32, 32, self.sheet, mult=2)
+        misses = helpers.misses
+        assert(helpers.get_image(32, 0, 32, 32, self.sheet, mult=2) is first)
+        assert(helpers.misses == misses)
+        assert(first.get_size() == (64, 64))
+        assert(first.get_at((0, 0)) == (200, 10, 10, 255))
+
+        assert(helpers.get_image(0, 0, 32, 32, self.sheet, mult=2) is not first)
+        assert(helpers.get_image(32, 0, 32, 32, self.sheet, mult=2, y_mult=1) is not first)
+        assert(helpers.get_image(32, 0, 32, 32, self.sheet.copy(), mult=2) is not first)
+
+
+    def test_opt_out(self) -> None:
+        shared = helpers.get_image(32, 0, 32, 32, self.sheet)
+        own = helpers.get_image(32, 0, 32, 32, self.sheet, cache=False)
+        assert(own is not shared)
+        own.fill((0, 0, 0, 0))
+        assert(helpers.get_image(32, 0, 32, 32, self.sheet).get_at((0, 0)) == (200, 10, 10, 255))
@@ -0,0 +1,31 @@
+from ..components import generation, levels
+from .. import constants as c
+
+from concurrent import futures
+from concurrent.futures.process import BrokenProcessPool
+import unittest
+
+
+class TestLevelResult(unittest.TestCase):
+    def test_failed_future(self) -> None:
+        future = futures.Future() # type: futures.Future
+        future.set_exception(BrokenProcessPool("workers died"))
+        assert(levels.result(future) is None)
+
+        future = futures.Future()
+        future.set_exception(ValueError("bad level"))
+        assert(levels.result(future) is None)
+
+
+    def test_not_done(self) -> None:
+        future = futures.Future() # type: futures.Future
+        assert(levels.result(future, timeout=0.01) is None)
+        assert(future.cancelled())
+        assert(levels.result(None) is None)
+
+
+    def test_done(self) -> None:
+        data = generation.MapData(4, 3, c.Biome.CAVE)
+        future = futures.Future() # type: futures.Future
+        future.set_result(data)
+        assert(levels.result(future) is data)
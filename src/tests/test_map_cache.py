@@ -0,0 +1,68 @@
+from ..components import generation, map_cache
+from .. import constants as c
+
+import os
+import tempfile
+import unittest
+
+
+def same_data(first, second):
+    return (first.width == second.width and first.height == second.height
+            and first.biome == second.biome and first.seed == second.seed
+            and first.grid == second.grid
+            and first.collidable_grid == second.collidable_grid
+            and first.tiles == second.tiles
+            and first.scenery == second.scenery
+            and first.corners == second.corners)
+
+
+class TestMapCache(unittest.TestCase):
+    def test_seeded_generation_repeats(self) -> None:
+        first = generation.generate_seeded(30, 20, c.Biome.FARMLAND, 99)
+        second = generation.generate_seeded(30, 20, c.Biome.FARMLAND, 99)
+        assert(same_data(first, second))
+        assert(first.seed == 99)
+
+
+    def test_round_trip(self) -> None:
+        for biome in [c.Biome.FARMLAND, c.Biome.CAVE]:
+            data = generation.generate_seeded(30, 20, biome, 5)
+            assert(same_data(map_cache.loads(map_cache.dumps(data)), data))
+
+
+    def test_generate_uses_cache(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            first = map_cache.generate(25, 15, c.Biome.FARMLAND, 7, directory)
+            path = map_cache.cache_path(7, c.Biome.FARMLAND, 25, 15, directory)
+            assert(os.path.exists(path))
+
+            second = map_cache.generate(25, 15, c.Biome.FARMLAND, 7, directory)
+            assert(same_data(first, second))
+
+
+    def test_no_cache(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            data = map_cache.generate(25, 15, c.Biome.CAVE, 7, directory, cache=False)
+            assert(os.listdir(directory) == [])
+            assert(same_data(data, generation.generate_seeded(25, 15, c.Biome.CAVE, 7)))
+
+
+    def test_seeds_out_of_range(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            for seed in [-1, 2**40 + 3]:
+                data = map_cache.generate(20, 15, c.Biome.FARMLAND, seed, directory)
+                assert(data.seed == seed & 0xFFFFFFFF)
+                path = map_cache.cache_path(data.seed, c.Biome.FARMLAND, 20, 15, directory)
+                assert(same_data(map_cache.load(path), data))
+                assert(same_data(generation.generate_seeded(20, 15, c.Biome.FARMLAND, seed), data))
+
+
+    def test_bad_file_is_generated_again(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            path = map_cache.cache_path(7, c.Biome.CAVE, 25, 15, directory)
+            with open(path, "wb") as f:
+                f.write(b"GMAP not really")
+
+            data = map_cache.generate(25, 15, c.Biome.CAVE, 7, directory)
+            assert(same_data(data, generation.generate_seeded(25, 15, c.Biome.CAVE, 7)))
+            assert(same_data(map_cache.load(path), data))
@@ -0,0 +1,50 @@
+from ..components import generation
+from ..components import minimap
+from .. import constants as c
+
+import unittest
+
+import numpy as np
+import pygame
+
+
+class TestMinimap(unittest.TestCase):
+    def setUp(self) -> None:
+        self.data = generation.MapData(30, 20, c.Biome.FARMLAND)
+        self.data.tiles.array[:, :] = generation.tile_name_indices["grass"]
+        self.data.tiles.set(3, 4, generation.tile_name_indices["water"])
+        self.data.collidable_grid.set(5, 6, 1)
+
+        palette = np.zeros((len(generation.tile_names), 3), dtype=np.uint8)
+        palette[generation.tile_name_indices["grass"]] = (0, 200, 0)
+        palette[generation.tile_name_indices["water"]] = (0, 0, 200)
+        self.minimap = minimap.Minimap(self.data, palette)
+
+
+    def test_build(self) -> None:
+        surface = self.minimap.build()
+        assert(surface.get_size() == (30, 20))
+        assert(surface.get_at((0, 0))[:3] == (0, 200, 0))
+        assert(surface.get_at((3, 4))[:3] == (0, 0, 200))
+        assert(surface.get_at((5, 6))[:3] == c.MINIMAP_SCENERY_COLOR)
+
+
+    def test_patch(self) -> None:
+        surface = self.minimap.build()
+        version = self.minimap.version
+
+        self.data.collidable_grid.set(5, 6, 0)
+        self.data.collidable_grid.set(7, 7, 1)
+        self.minimap.patch(pygame.rect.Rect(5 * c.TILE_SIZE, 6 * c.TILE_SIZE, c.TILE_SIZE, c.TILE_SIZE))
+
+        # Only the cells under the rect are colored again.
+        assert(surface.get_at((5, 6))[:3] == (0, 200, 0))
+        assert(surface.get_at((7, 7))[:3] == (0, 200, 0))
+        assert(self.minimap.version > version)
+
+
+    def test_window(self) -> None:
+        assert(self.minimap.window((0, 0), (100, 100)) == pygame.rect.Rect(0, 0, 30, 20))
+
+        window = self.minimap.window((29 * c.TILE_SIZE, 10 * c.TILE_SIZE), (10, 10))
+        assert(window == pygame.rect.Rect(20, 5, 10, 10))
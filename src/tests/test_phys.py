@@ -0,0 +1,21 @@
+from .. import phys
+
+import unittest
+
+
+class TestPhys(unittest.TestCase):
+    def test_sub_pixel_steps_add_up(self) -> None:
+        """ 80 pixels a second moves 80 pixels in a second of ticks. """
+        for distance in [80 / 60, -80 / 60, 0.3]:
+            carry = 0.0
+            moved = 0
+            for _ in range(60):
+                step, carry = phys.sub_pixel_step(distance, carry)
+                moved += step
+            assert(moved == round(distance * 60))
+
+
+    def test_lerp(self) -> None:
+        assert(phys.lerp((0, 10), (10, 0), 0) == (0, 10))
+        assert(phys.lerp((0, 10), (10, 0), 0.5) == (5, 5))
+        assert(phys.lerp((0, 10), (10, 0), 1) == (10, 0))
@@ -0,0 +1,80 @@
+from ..components import render_list
+
+import random
+import unittest
+
+import pygame
+
+
+class Box(pygame.sprite.Sprite):
+    def __init__(self, x, y, w, h, color=(0, 0, 0)) -> None:
+        super().__init__()
+        self.rect = pygame.rect.Rect(x, y, w, h)
+        self.image = pygame.Surface((w, h))
+        self.image.fill(color)
+
+
+class TestRenderList(unittest.TestCase):
+    def setUp(self) -> None:
+        rng = random.Random(5)
+        self.render = render_list.RenderList()
+        self.boxes = [Box(rng.randint(0, 500), rng.randint(0, 500), 10, rng.randint(1, 50)) for _ in range(100)]
+        self.render.add_to_layer(render_list.ENTITIES, *self.boxes[:50], moving=True)
+        self.ground = self.boxes[50:]
+        self.render.add_to_layer(render_list.GROUND, *self.ground)
+
+
+    def depth(self, box):
+        return (box not in self.ground, box.rect.bottom)
+
+
+    def assert_sorted(self):
+        # Equal depths can be in any order.
+        assert(set(self.render.order) == set(self.boxes))
+        assert([self.depth(box) for box in self.render.order] == sorted(map(self.depth, self.boxes)))
+
+
+    def test_sorted_by_layer_then_depth(self) -> None:
+        self.assert_sorted()
+        assert(self.render.keys == sorted(self.render.keys))
+
+
+    def test_refresh_and_kill(self) -> None:
+        for box in self.boxes[:20]:
+            box.rect.y = 500 - box.rect.y
+        self.boxes.pop(10).kill()
+        self.boxes.pop(60).kill()
+        self.render.refresh()
+
+        self.assert_sorted()
+        assert(len(self.render.keys) == len(self.boxes))
+
+
+    def test_front_sprite_drawn_last(self) -> None:
+        render = render_list.RenderList()
+        back = Box(0, 0, 20, 20, (255, 0, 0))
+        front = Box(0, 5, 20, 20, (0, 0, 255))
+        tree_top = Box(0, -10, 20, 20, (0, 255, 0))
+        render.add_to_layer(render_list.ENTITIES, front, back, moving=True)
+        render.add_to_layer(render_list.ENTITIES, tree_top, depth_offset=20)
+
+        surface = pygame.Surface((20, 20))
+        render.render(surface, surface.get_rect())
+        assert(surface.get_at((10, 8))[:3] == (0, 255, 0))
+        assert(surface.get_at((10, 15))[:3] == (0, 0, 255))
+
+        front.rect.y = -5
+        render.refresh()
+        render.render(surface, surface.get_rect())
+        assert(surface.get_at((10, 15))[:3] == (255, 0, 0))
+
+
+    def test_snapshot_keeps_frame(self) -> None:
+        camera = pygame.rect.Rect(100, 100, 200, 200)
+        snapshot = self.render.snapshot(camera, offset=camera.topleft)
+        visible = [box for box in self.render.order if camera.colliderect(box.rect)]
+        assert([image for image, __ in snapshot] == [box.image for box in visible])
+        assert(snapshot[0][1] == (visible[0].rect.x - 100, visible[0].rect.y - 100))
+
+        visible[0].rect.x += 1000
+        assert(snapshot[0][1] == (visible[0].rect.x - 1100, visible[0].rect.y - 100))
@@ -0,0 +1,67 @@
+from ..components import render_worker
+from .. import constants as c
+
+import contextlib
+import io
+import os
+import unittest
+
+import pygame
+
+
+class Ground:
+    """Stands in for a tilemap."""
+    def __init__(self, color) -> None:
+        self.color = color
+
+
+    def update(self, surface, camera, offset=None) -> None:
+        surface.fill(self.color)
+
+
+class TestRenderWorker(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        # The buffers are converted for the display.
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        pygame.display.init()
+        pygame.display.set_mode((1, 1))
+
+
+    def test_submit_and_present(self) -> None:
+        worker = render_worker.RenderWorker()
+        worker.start()
+
+        screen = pygame.Surface((8, 6))
+        screen.fill(c.BLACK)
+        # Nothing finished yet.
+        worker.present(screen)
+        assert(screen.get_at((0, 0)) == c.BLACK)
+
+        sprite = pygame.Surface((2, 2))
+        sprite.fill(c.WHITE)
+        worker.submit(render_worker.Frame(Ground((0, 0, 255)), (10, 10, 8, 6), ((sprite, (3, 2)),)))
+        worker.submit(render_worker.Frame(Ground((255, 0, 0)), (10, 10, 8, 6), ((sprite, (3, 2)),)))
+
+        worker.cleanup()
+        assert(not worker.is_alive())
+
+        # The last frame submitted is presented.
+        worker.present(screen)
+        assert(screen.get_at((0, 0)) == (255, 0, 0, 255))
+        assert(screen.get_at((4, 3)) == c.WHITE)
+
+
+    def test_bad_frame_is_skipped(self) -> None:
+        worker = render_worker.RenderWorker()
+        worker.start()
+
+        with contextlib.redirect_stderr(io.StringIO()) as errors:
+            worker.submit(render_worker.Frame(None, (0, 0, 4, 4), ()))
+            worker.submit(render_worker.Frame(Ground((0, 255, 0)), (0, 0, 4, 4), ()))
+            worker.cleanup()
+        assert("AttributeError" in errors.getvalue())
+
+        screen = pygame.Surface((4, 4))
+        worker.present(screen)
+        assert(screen.get_at((1, 1)) == (0, 255, 0, 255))
@@ -0,0 +1,49 @@
+from ..components import spatial
+
+import random
+import unittest
+
+import pygame
+
+
+class Box(pygame.sprite.Sprite):
+    def __init__(self, x, y, w, h) -> None:
+        super().__init__()
+        self.rect = pygame.rect.Rect(x, y, w, h)
+
+
+class TestSpatialGroup(unittest.TestCase):
+    def setUp(self) -> None:
+        rng = random.Random(3)
+        self.group = spatial.SpatialGroup(cell_size=100)
+        self.boxes = [Box(rng.randint(-50, 950), rng.randint(-50, 950), rng.randint(1, 250), rng.randint(1, 250)) for _ in range(300)]
+        self.group.add(*self.boxes)
+
+
+    def brute_force(self, rect):
+        return [sprite for sprite in self.group if rect.colliderect(sprite.rect)]
+
+
+    def test_query_matches_brute_force(self) -> None:
+        """ Same sprites, in the group's own order. """
+        for rect in [pygame.rect.Rect(0, 0, 100, 100), pygame.rect.Rect(130, 470, 333, 211), pygame.rect.Rect(-100, -100, 5000, 5000)]:
+            assert(self.group.query(rect) == self.brute_force(rect))
+
+
+    def test_kill_and_move(self) -> None:
+        rect = pygame.rect.Rect(200, 200, 400, 400)
+        for sprite in self.group.query(rect)[:5]:
+            sprite.kill()
+
+        moved = next(iter(self.group))
+        moved.rect.topleft = (5000, 5000)
+        self.group.move(moved)
+
+        assert(self.group.query(rect) == self.brute_force(rect))
+        assert(self.group.query(pygame.rect.Rect(4990, 4990, 20, 20)) == [moved])
+
+
+    def test_empty(self) -> None:
+        self.group.empty()
+        assert(self.group.buckets == {})
+        assert(self.group.query(pygame.rect.Rect(0, 0, 1000, 1000)) == [])
@@ -0,0 +1,69 @@
+from ..components import text, user_interface
+from .. import constants as c
+from .. import setup
+
+import unittest
+
+import pygame
+
+
+class TestText(unittest.TestCase):
+    def setUp(self) -> None:
+        pygame.font.init()
+        text.clear()
+        self.font = pygame.font.Font(None, 14)
+
+
+    def test_cached(self) -> None:
+        first = text.render(self.font, "lumber", c.WHITE)
+        misses = text.misses
+        assert(text.render(self.font, "lumber", c.WHITE) is first)
+        assert(text.misses == misses)
+
+        assert(text.render(self.font, "lumber", c.BLACK) is not first)
+        assert(text.render(self.font, "lumber", c.WHITE, antialias=False) is not first)
+
+
+    def test_least_recently_used(self) -> None:
+        first = text.render(self.font, "0", c.WHITE)
+        for i in range(1, c.TEXT_CACHE_SIZE):
+            text.render(self.font, str(i), c.WHITE)
+        # Used again, so the next one pushes out "1" instead.
+        text.render(self.font, "0", c.WHITE)
+        text.render(self.font, "new", c.WHITE)
+
+        assert(text.render(self.font, "0", c.WHITE) is first)
+        misses = text.misses
+        text.render(self.font, "1", c.WHITE)
+        assert(text.misses == misses + 1)
+
+
+
+class TestHudText(unittest.TestCase):
+    def setUp(self) -> None:
+        pygame.font.init()
+        self.font = setup.FONTS.get("game_kenvector_future_thin")
+        setup.FONTS["game_kenvector_future_thin"] = pygame.font.Font(None, 14)
+
+
+    def tearDown(self) -> None:
+        if self.font is None:
+            del setup.FONTS["game_kenvector_future_thin"]
+        else:
+            setup.FONTS["game_kenvector_future_thin"] = self.font
+
+
+    def test_unchanged_number_is_reused(self) -> None:
+        hud = user_interface.Hud()
+        surface = pygame.Surface((200, 50))
+        misses = text.misses
+
+        hud.render_text(surface, "fps", "60", c.WHITE, (20, 20), number=True)
+        first = hud.drawn["fps"][2]
+        hud.render_text(surface, "fps", "60", c.WHITE, (20, 20), number=True)
+        assert(hud.drawn["fps"][2] is first)
+
+        hud.render_text(surface, "fps", "59", c.WHITE, (20, 20), number=True)
+        assert(hud.drawn["fps"][2] is not first)
+        # Numbers stay out of the text cache.
+        assert(text.misses == misses)
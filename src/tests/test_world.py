@@ -0,0 +1,129 @@
+from ..components import generation, scenery, world
+from .. import constants as c
+from .. import setup
+from .. import tools
+
+import os
+import unittest
+
+import pygame
+
+
+class TestWorld(unittest.TestCase):
+    def test_chunk_seed(self) -> None:
+        """ Neighboring chunks get different seeds. """
+        seeds = {world.chunk_seed(42, cx, cy) for cx in range(8) for cy in range(8)}
+        assert(len(seeds) == 64)
+        assert(world.chunk_seed(42, 3, 4) == world.chunk_seed(42, 3, 4))
+
+
+    def test_generate_chunk_repeats(self) -> None:
+        """ A forgotten chunk comes back the same. """
+        first = world.generate_chunk(7, 5, 6, 16, 16, c.Biome.FARMLAND)
+        second = world.generate_chunk(7, 5, 6, 16, 16, c.Biome.FARMLAND)
+
+        assert(first.grid == second.grid)
+        assert(first.tiles == second.tiles)
+        assert(first.collidable_grid == second.collidable_grid)
+        assert(first.scenery == second.scenery)
+        assert(first.corners == second.corners)
+
+
+    def test_generate_chunk_world_edge(self) -> None:
+        """ Chunks on the edge of the world are the normal size. """
+        data = world.generate_chunk(7, 0, 0, 4, 4, c.Biome.FARMLAND)
+        assert(data.grid.array.shape == (c.CHUNK_SIZE, c.CHUNK_SIZE))
+
+        data = world.generate_chunk(7, 3, 3, 4, 4, c.Biome.CAVE)
+        assert(data.grid.array.shape == (c.CHUNK_SIZE, c.CHUNK_SIZE))
+
+
+
+class TestChunkedMap(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        # Loading a chunk makes its scenery sprites.
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        pygame.display.init()
+        pygame.display.set_mode((1, 1))
+        cls.gfx = setup.GFX
+        setup.GFX = tools.recursive_load_gfx(os.path.join("data", "graphics", "tiles"))
+
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        setup.GFX = cls.gfx
+
+
+    def setUp(self) -> None:
+        self.max_loaded_chunks = c.MAX_LOADED_CHUNKS
+        c.MAX_LOADED_CHUNKS = 2
+        self.world = world.ChunkedMap(c.CHUNK_SIZE * 4, c.CHUNK_SIZE * 4, c.Biome.FARMLAND, 11)
+
+
+    def tearDown(self) -> None:
+        c.MAX_LOADED_CHUNKS = self.max_loaded_chunks
+
+
+    def evict(self, cx: int, cy: int) -> None:
+        """Load other chunks until (cx, cy) is forgotten."""
+        others = [(x, y) for y in range(4) for x in range(4) if (x, y) != (cx, cy)]
+        for x, y in others[:c.MAX_LOADED_CHUNKS]:
+            self.world.chunk(x, y)
+        assert((cx, cy) not in self.world.chunks)
+
+
+    def test_evicts_least_recently_used(self) -> None:
+        first = self.world.chunk(0, 0)
+        self.world.chunk(1, 0)
+        # Used again, so (1, 0) is the one forgotten next.
+        self.world.chunk(0, 0)
+        self.world.chunk(2, 0)
+
+        assert(len(self.world.chunks) == c.MAX_LOADED_CHUNKS)
+        assert(list(self.world.chunks) == [(0, 0), (2, 0)])
+        assert(self.world.chunks[(0, 0)] is first)
+
+
+    def test_evicted_chunk_comes_back_the_same(self) -> None:
+        chunk = self.world.chunk(1, 1)
+        first = chunk.data
+        self.evict(1, 1)
+        # Its sprites are gone with it.
+        assert(chunk.sprites)
+        assert(not any(sprite.alive() for sprite in chunk.sprites))
+
+        second = self.world.chunk(1, 1).data
+        assert(second is not first)
+        assert(first.grid == second.grid)
+        assert(first.tiles == second.tiles)
+        assert(first.scenery == second.scenery)
+
+
+    def test_edits_outlive_eviction(self) -> None:
+        x, y = c.CHUNK_SIZE + 3, 5
+        value = 1 - self.world.collidable_grid.get(x, y)
+        self.world.collidable_grid.set(x, y, value)
+        self.evict(1, 0)
+
+        assert(self.world.collidable_grid.get(x, y) == value)
+
+
+    def test_cut_trees_outlive_eviction(self) -> None:
+        for cx, cy in [(x, y) for y in range(4) for x in range(4)]:
+            trees = [sprite for sprite in self.world.chunk(cx, cy).sprites if isinstance(sprite, scenery.TreeBottom)]
+            if trees:
+                break
+        tree = trees[0]
+        location = tree.rect.topleft
+        trees_before = len(trees)
+
+        tree.destroy(0)
+        self.evict(cx, cy)
+
+        chunk = self.world.chunk(cx, cy)
+        trees = [sprite for sprite in chunk.sprites if isinstance(sprite, scenery.TreeBottom)]
+        assert(len(trees) == trees_before - 1)
+        assert(location not in [sprite.rect.topleft for sprite in trees])
+        point = (location[0] // c.TILE_SIZE - cx * c.CHUNK_SIZE, location[1] // c.TILE_SIZE - cy * c.CHUNK_SIZE)
+        assert(all((s[1], s[2]) != point for s in chunk.data.scenery if s[0] == generation.TREE))
@@ -1,5 +1,6 @@
-from typing import Iterable, List, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
+import concurrent.futures
 import os
 
 from PIL import Image
@@ -52,15 +53,14 @@ def colorize_quality(images: List[pygame.Surface], color: Tuple[int, ...]) -> Li
     return colored
 
 
-def recursive_load_gfx(path, accept=(".png", ".bmp", ".svg")):
+def recursive_index_gfx(path, accept=(".png", ".bmp", ".svg")):
     """
-    Load graphics files.
+    Find graphics files, by name.
     This operates on a one folder at a time basis.
 
     Note: An empty string doesn't count as invalid,
     since that represents a folder name.
     """
-    colorkey = c.UGLY_PURPLE
     graphics = {}
 
     for pic in os.listdir(path):
@@ -68,15 +68,7 @@ def recursive_load_gfx(path, accept=(".png", ".bmp", ".svg")):
         name, ext = os.path.splitext(pic)
 
         if ext.lower() in accept:
-            img = pygame.image.load(pic_path)
-
-            if img.get_alpha():
-                #img = img.convert_alpha()
-                img.convert_alpha()
-            else:
-                img = img.convert()
-                img.set_colorkey(colorkey)
-            graphics[name] = img
+            graphics[name] = pic_path
 
         elif not ext:
             pass
@@ -88,32 +80,79 @@ def recursive_load_gfx(path, accept=(".png", ".bmp", ".svg")):
     return graphics
 
 
-def load_gfx(path):
-    """Loads all the files in the graphics folder
-    and also one more folder level deep.
-    Doesn't recurse files deeper than that."""
-    graphics = {}
+def load_image(path: str) -> pygame.Surface:
+    return prepare_image(pygame.image.load(path))
+
 
-    for item in os.listdir(path):
-        item_path = os.path.join(path, item)
-        name, ext = os.path.splitext(item)
+def prepare_image(img: pygame.Surface) -> pygame.Surface:
+    """Convert a freshly decoded image for drawing."""
+    colorkey = c.UGLY_PURPLE
+
+    if img.get_alpha():
+        #img = img.convert_alpha()
+        img.convert_alpha()
+    else:
+        img = img.convert()
+        img.set_colorkey(colorkey)
+    return img
 
+
+def decode_all(decode: Callable[[Any], Any], sources: Dict[str, Any], workers: int=c.ASSET_WORKERS) -> Dict[str, Any]:
+    """Run decode on every source at once, in a thread pool. Decoding
+    images and sounds mostly runs outside of the GIL.
+
+    Surfaces that come out of it still have to be converted, on the main
+    thread.
+    """
+    names = list(sources)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+        return dict(zip(names, pool.map(decode, [sources[name] for name in names])))
+
+
+def recursive_load_gfx(path, accept=(".png", ".bmp", ".svg")):
+    """Load graphics files, one folder at a time."""
+    decoded = decode_all(pygame.image.load, recursive_index_gfx(path, accept))
+    return {name: prepare_image(img) for name, img in decoded.items()}
+
+
+def index_gfx(path):
+    """Finds all the files in the graphics folder
+    and also one more folder level deep.
+    Doesn't recurse files deeper than that.
+
+    A name found in more than one folder is reported, the folder that
+    comes last keeps it.
+    """
+    folders = [path]
+    for item in sorted(os.listdir(path)):
         # If there is no extension, assume it's a folder.
-        if ext == "":
-            # WARNING: Update can overwrite existing keys
-            graphics.update(recursive_load_gfx(item_path))
-        else:
-            graphics.update(recursive_load_gfx(path))
+        if os.path.splitext(item)[1] == "":
+            folders.append(os.path.join(path, item))
+
+    graphics = {}
+    for folder in folders:
+        for name, pic_path in recursive_index_gfx(folder).items():
+            if name in graphics:
+                print("Graphics name collision. {} replaces {}".format(pic_path, graphics[name]))
+            graphics[name] = pic_path
 
     # sanity check
     if not graphics:
-        print("No graphics loaded.")
+        print("No graphics found.")
 
     return graphics
 
 
-# Load all the fonts for all the sizes that I want to use.
-def load_fonts(path, accept=(".ttf")):
+def load_gfx(path):
+    """Loads all the files in the graphics folder
+    and also one more folder level deep."""
+    decoded = decode_all(pygame.image.load, index_gfx(path))
+    return {name: prepare_image(img) for name, img in decoded.items()}
+
+
+# Find all the fonts for all the sizes that I want to use.
+def index_fonts(path, accept=(".ttf")):
+    """Font name to (path, size)."""
     fonts = {}
 
     for pair in c.FONT_SIZE_DICT.items():
@@ -124,26 +163,39 @@ def load_fonts(path, accept=(".ttf")):
             if ext.lower() in accept:
                 # Add the intended size use to the name.
                 name = "{}_{}".format(font_size_name, name)
-                fonts[name] = pygame.font.Font(os.path.join(path, font), font_size)
+                fonts[name] = (os.path.join(path, font), font_size)
             else:
                 print("Received invalid font. {}".format(font))
 
     return fonts
 
 
-def load_sfx(path, accept=(".wav", ".mpe", ".ogg", ".mdi")):
+def load_font(source: Tuple[str, int]) -> pygame.font.Font:
+    path, size = source
+    return pygame.font.Font(path, size)
+
+
+def load_fonts(path, accept=(".ttf")):
+    return decode_all(load_font, index_fonts(path, accept))
+
+
+def index_sfx(path, accept=(".wav", ".mpe", ".ogg", ".mdi")):
     sounds = {}
     for sound in os.listdir(path):
         name, ext = os.path.splitext(sound)
 
         if ext.lower() in accept:
-            sounds[name] = pygame.mixer.Sound(os.path.join(path, sound))
+            sounds[name] = os.path.join(path, sound)
         else:
             print("Received invalid sound effect. {}".format(sound))
 
     return sounds
 
 
+def load_sfx(path, accept=(".wav", ".mpe", ".ogg", ".mdi")):
+    return decode_all(pygame.mixer.Sound, index_sfx(path, accept))
+
+
 def load_music(path, accept=(".wav", ".mp3", ".ogg", ".mdi")):
     pass
 
@@ -225,13 +277,24 @@ def test_collide(sprite: pygame.sprite.Sprite, x_vel: int, y_vel: int, collidabl
     return hit_wall
 
 
-def draw_visible(surface: pygame.surface.Surface, camera: pygame.rect.Rect, groups: List[Iterable[pygame.sprite.Sprite]]) -> None:
+def draw_visible(surface: pygame.surface.Surface, camera: pygame.rect.Rect, groups: List[Iterable[pygame.sprite.Sprite]], offset: Optional[Tuple[int, int]]=None) -> None:
     """
     Takes a list of sprite groups or a list of sprites, as long as
     the items in the iterable are sprites.
+
+    Groups with a query method, like spatial.SpatialGroup, are asked for
+    the sprites under the camera instead of testing all of them.
+
+    :param offset: Subtracted from every sprite location. For surfaces
+                   that only cover the camera, instead of the whole map.
     """
-    #return { item.rect for item in group if camera.colliderect(item.rect) }
-    #vis = { item for item in group if camera.colliderect(item.rect) }
+    offset_x, offset_y = offset if offset is not None else (0, 0)
+
     for items in groups:
-        tmp_group = pygame.sprite.Group({ item for item in items if camera.colliderect(item.rect) })
-        tmp_group.draw(surface)
+        query = getattr(items, "query", None)
+        if query is not None:
+            visible = query(camera)
+        else:
+            visible = [item for item in items if camera.colliderect(item.rect)]
+
+        surface.blits([(item.image, (item.rect.x - offset_x, item.rect.y - offset_y)) for item in visible], doreturn=False)